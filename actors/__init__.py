@@ -7,8 +7,10 @@ including processors, routers, and utility classes.
 
 from .base import (
     BaseActor,
+    BatchingProcessorActor,
     ProcessorActor,
     RouterActor,
+    install_uvloop,
     run_actors_forever,
     start_multiple_actors,
     stop_multiple_actors,
@@ -27,8 +29,10 @@ __all__ = [
     # Base classes
     "BaseActor",
     "ProcessorActor",
+    "BatchingProcessorActor",
     "RouterActor",
     # Utility functions
+    "install_uvloop",
     "run_actors_forever",
     "start_multiple_actors",
     "stop_multiple_actors",
@@ -6,15 +6,18 @@ agent system, implementing NATS-based communication and message routing.
 """
 
 import asyncio
-import json
 import logging
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional, Set
+from typing import Any, Coroutine, Dict, List, Optional, Set, Tuple
 
 import nats
 from models.message import Message, MessagePayload
 from nats.js import JetStreamContext
 from nats.aio.msg import Msg
+from nats.aio.subscription import Subscription
+
+# Python 3.11+; older interpreters fall back to asyncio.wait_for()
+_asyncio_timeout = getattr(asyncio, "timeout", None)
 
 
 class BaseActor(ABC):
@@ -32,14 +35,19 @@ class BaseActor(ABC):
         self.nats_url: str = nats_url
         self.subject: str = f"ecommerce.support.{name}"
 
+        # Route steps are JSON strings, so a message for this actor always contains these bytes
+        self._name_bytes: bytes = f'"{name}"'.encode()
+
         # NATS connections
         self.nc: Optional[nats.NATS] = None
         self.js: Optional[JetStreamContext] = None
+        self._sub: Optional[Subscription] = None
 
         # Configuration
         self.max_retries: int = 3
         self.retry_delay: float = 1.0
         self.processing_timeout: float = 30.0
+        self.max_in_flight: int = 8
 
         # Setup logging
         self.logger: logging.Logger = logging.getLogger(f"actor.{name}")
@@ -48,6 +56,7 @@ class BaseActor(ABC):
         # Runtime state
         self._running: bool = False
         self._tasks: Set[asyncio.Task[Any]] = set()
+        self._in_flight: Optional[asyncio.Semaphore] = None
 
     async def start(self) -> None:
         """Start the actor and begin listening for messages."""
@@ -65,6 +74,9 @@ class BaseActor(ABC):
             # Ensure stream exists
             await self._ensure_stream()
 
+            # Bound the messages being processed at once; created here so it binds to the running loop
+            self._in_flight = asyncio.Semaphore(self.max_in_flight)
+
             # Subscribe to messages
             await self._subscribe()
 
@@ -83,14 +95,26 @@ class BaseActor(ABC):
         self.logger.info(f"Stopping actor '{self.name}'")
         self._running = False
 
+        # Stop the subscription so no new messages are dispatched to the callback
+        if self._sub is not None:
+            try:
+                await self._sub.unsubscribe()
+            except Exception as e:
+                self.logger.warning(f"Failed to unsubscribe: {e}")
+            self._sub = None
+
+        # Take ownership of the in-flight tasks so done callbacks can't mutate the set underneath us
+        tasks: Set[asyncio.Task[Any]] = self._tasks
+        self._tasks = set()
+
         # Cancel all running tasks
-        for task in self._tasks:
+        for task in tasks:
             if not task.done():
                 task.cancel()
 
         # Wait for tasks to complete
-        if self._tasks:
-            await asyncio.gather(*self._tasks, return_exceptions=True)
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
 
         # Close NATS connection
         if self.nc:
@@ -126,7 +150,8 @@ class BaseActor(ABC):
             raise RuntimeError("JetStream not initialized")
 
         try:
-            await self.js.subscribe(
+            # Messages are pushed straight to the callback by the client's reader task
+            self._sub = await self.js.subscribe(
                 self.subject,
                 cb=self._handle_message_wrapper,
                 durable=f"{self.name}_durable",
@@ -139,35 +164,50 @@ class BaseActor(ABC):
 
     async def _handle_message_wrapper(self, msg: Msg) -> None:
         """Wrapper for message handling with error management."""
+        # Wait for a processing slot; while we wait, further deliveries stay
+        # buffered in the subscription instead of piling up as tasks
+        in_flight: Optional[asyncio.Semaphore] = self._in_flight
+        if in_flight is not None:
+            await in_flight.acquire()
+
         # Create a task for processing
         task: asyncio.Task[None] = asyncio.create_task(self._process_message(msg))
         self._tasks.add(task)
 
         # Cleanup completed task
-        task.add_done_callback(self._tasks.discard)
+        task.add_done_callback(self._on_task_done)
+
+    def _on_task_done(self, task: asyncio.Task[None]) -> None:
+        """Forget a finished message task and free its processing slot."""
+        self._tasks.discard(task)
+        if self._in_flight is not None:
+            self._in_flight.release()
 
     async def _process_message(self, msg: Msg) -> None:
         """Process incoming NATS message."""
         message_obj: Optional[Message] = None
 
         try:
-            # Deserialize message
-            message_data: Dict[str, Any] = json.loads(msg.data.decode())
-            message_obj = Message(**message_data)
+            # Messages that never mention this actor can't be routed to it; reject them unparsed
+            if self._name_bytes not in msg.data:
+                self.logger.warning("Received message not routed to %s", self.name)
+                await msg.nak()
+                return
 
-            self.logger.info(f"Processing message {message_obj.message_id} for session {message_obj.session_id}")
+            # Parse and validate the raw bytes in one step
+            message_obj = Message.from_wire(msg.data)
+
+            self.logger.info("Processing message %s for session %s", message_obj.message_id, message_obj.session_id)
 
             # Check if this is the correct step in the route
             current_actor: Optional[str] = message_obj.route.get_current_actor()
             if current_actor != self.name:
-                self.logger.warning(f"Received message for wrong actor. Expected: {current_actor}, Got: {self.name}")
+                self.logger.warning("Received message for wrong actor. Expected: %s, Got: %s", current_actor, self.name)
                 await msg.nak()
                 return
 
             # Process the message payload
-            result: Optional[Dict[str, Any]] = await asyncio.wait_for(
-                self.process(message_obj.payload), timeout=self.processing_timeout
-            )
+            result: Optional[Dict[str, Any]] = await self._process_with_timeout(message_obj.payload)
 
             # Add processing result to message
             if result:
@@ -179,16 +219,25 @@ class BaseActor(ABC):
             # Acknowledge successful processing
             await msg.ack()
 
-            self.logger.info(f"Successfully processed message {message_obj.message_id}")
+            self.logger.info("Successfully processed message %s", message_obj.message_id)
 
         except asyncio.TimeoutError:
-            self.logger.error(f"Processing timeout for message {message_obj.message_id if message_obj else 'unknown'}")
+            self.logger.error("Processing timeout for message %s", message_obj.message_id if message_obj else "unknown")
             await self._handle_error(msg, message_obj, "timeout", "Processing timeout")
 
         except Exception as e:
-            self.logger.error(f"Error processing message: {e}")
+            self.logger.error("Error processing message: %s", e)
             await self._handle_error(msg, message_obj, "processing_error", str(e))
 
+    async def _process_with_timeout(self, payload: MessagePayload) -> Optional[Dict[str, Any]]:
+        """Run process() on the current task, raising asyncio.TimeoutError after processing_timeout."""
+        if _asyncio_timeout is None:
+            return await asyncio.wait_for(self.process(payload), timeout=self.processing_timeout)
+
+        # asyncio.timeout() arms a call_later handle that cancels this task, with no wrapper task
+        async with _asyncio_timeout(self.processing_timeout):
+            return await self.process(payload)
+
     async def _handle_error(self, msg: Msg, message_obj: Optional[Message], error_type: str, error_message: str) -> None:
         """Handle processing errors with retry logic."""
         try:
@@ -201,7 +250,7 @@ class BaseActor(ABC):
             retry_count: int = message_obj.metadata.get("retry_count", 0)
             if retry_count >= self.max_retries:
                 self.logger.error(
-                    f"Max retries exceeded for message {message_obj.message_id}, routing to error handler"
+                    "Max retries exceeded for message %s, routing to error handler", message_obj.message_id
                 )
                 await self._route_to_error_handler(message_obj, error_type, error_message)
                 await msg.ack()  # Don't reprocess
@@ -218,7 +267,7 @@ class BaseActor(ABC):
             await msg.nak()
 
         except Exception as e:
-            self.logger.error(f"Error in error handler: {e}")
+            self.logger.error("Error in error handler: %s", e)
             await msg.nak()
 
     async def _route_to_next(self, message: Message) -> None:
@@ -230,12 +279,12 @@ class BaseActor(ABC):
         if message.route.advance():
             next_actor: Optional[str] = message.route.get_current_actor()
             if next_actor:
-                next_subject: str = f"ecommerce.support.{next_actor}"
-                await self.js.publish(next_subject, json.dumps(message.model_dump()).encode())
-                self.logger.debug(f"Routed message to {next_actor}")
+                next_subject: str = message.to_nats_subject(next_actor)
+                await self.js.publish(next_subject, message.to_wire())
+                self.logger.debug("Routed message to %s", next_actor)
         else:
             # Route complete
-            self.logger.info(f"Message {message.message_id} completed processing")
+            self.logger.info("Message %s completed processing", message.message_id)
 
     async def _route_to_error_handler(self, message: Message, error_type: str, error_message: str) -> None:
         """Route message to error handler."""
@@ -243,11 +292,11 @@ class BaseActor(ABC):
             raise RuntimeError("JetStream not initialized")
 
         if message.route.error_handler:
-            error_subject: str = f"ecommerce.support.{message.route.error_handler}"
+            error_subject: str = message.to_nats_subject(message.route.error_handler)
             message.add_error(error_type, error_message, self.name)
 
-            await self.js.publish(error_subject, json.dumps(message.model_dump()).encode())
-            self.logger.info(f"Routed error message to {message.route.error_handler}")
+            await self.js.publish(error_subject, message.to_wire())
+            self.logger.info("Routed error message to %s", message.route.error_handler)
 
     async def _enrich_payload(self, payload: MessagePayload, result: Dict[str, Any]) -> None:
         """Enrich the payload with processing results."""
@@ -259,7 +308,7 @@ class BaseActor(ABC):
         if self.js is None:
             raise RuntimeError("Actor not started")
 
-        await self.js.publish(subject, json.dumps(message.model_dump()).encode())
+        await self.js.publish(subject, message.to_wire())
 
     @abstractmethod
     async def process(self, payload: MessagePayload) -> Optional[Dict[str, Any]]:
@@ -285,6 +334,106 @@ class ProcessorActor(BaseActor):
         super().__init__(name, nats_url)
 
 
+class BatchingProcessorActor(ProcessorActor):
+    """Base class for processor actors whose work is cheaper in batches (LLM, DB, vector search)."""
+
+    def __init__(
+        self,
+        name: str,
+        nats_url: str = "nats://localhost:4222",
+        max_batch_size: int = 16,
+        max_queue_time: float = 0.01,
+    ) -> None:
+        """
+        Initialize the batching processor actor.
+
+        Args:
+            name: Actor name (used for NATS subject)
+            nats_url: NATS server URL
+            max_batch_size: Largest number of payloads passed to one process_batch() call
+            max_queue_time: Longest time in seconds a payload waits for its batch to fill
+        """
+        super().__init__(name, nats_url)
+        self.max_batch_size: int = max_batch_size
+        self.max_queue_time: float = max_queue_time
+
+        # A batch can only fill if at least max_batch_size messages are processed at once
+        self.max_in_flight = max(self.max_in_flight, max_batch_size)
+
+        # Payloads waiting for the current batch, with the futures their callers await
+        self._batch: List[Tuple[MessagePayload, asyncio.Future[Optional[Dict[str, Any]]]]] = []
+        self._batch_handle: Optional[asyncio.TimerHandle] = None
+
+    async def stop(self) -> None:
+        """Drop the batch still being collected, then stop the actor."""
+        if self._batch_handle is not None:
+            self._batch_handle.cancel()
+            self._batch_handle = None
+
+        # Its payloads must not reach process_batch() once the connection is closing
+        batch, self._batch = self._batch, []
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(RuntimeError("Actor stopped"))
+
+        await super().stop()
+
+    async def process(self, payload: MessagePayload) -> Optional[Dict[str, Any]]:
+        """Queue the payload for the next batch and wait for its result."""
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[Optional[Dict[str, Any]]] = loop.create_future()
+        self._batch.append((payload, future))
+
+        if len(self._batch) >= self.max_batch_size:
+            self._dispatch_batch()
+        elif self._batch_handle is None:
+            self._batch_handle = loop.call_later(self.max_queue_time, self._dispatch_batch)
+
+        return await future
+
+    def _dispatch_batch(self) -> None:
+        """Hand the queued payloads to process_batch() in a task of their own."""
+        if self._batch_handle is not None:
+            self._batch_handle.cancel()
+            self._batch_handle = None
+
+        batch, self._batch = self._batch, []
+        if batch:
+            task: asyncio.Task[None] = asyncio.create_task(self._run_batch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, batch: List[Tuple[MessagePayload, asyncio.Future[Optional[Dict[str, Any]]]]]) -> None:
+        """Process one batch and resolve the futures of its callers."""
+        try:
+            results: List[Optional[Dict[str, Any]]] = await self.process_batch([payload for payload, _ in batch])
+            if len(results) != len(batch):
+                raise RuntimeError(f"process_batch returned {len(results)} results for {len(batch)} payloads")
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            # A caller that timed out has already cancelled its future
+            if not future.done():
+                future.set_result(result)
+
+    @abstractmethod
+    async def process_batch(self, payloads: List[MessagePayload]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Process a batch of message payloads.
+
+        Args:
+            payloads: The payloads to process, in arrival order
+
+        Returns:
+            One optional processing result per payload, in the same order
+        """
+        raise NotImplementedError
+
+
 class RouterActor(BaseActor):
     """Base class for smart router actors that make routing decisions."""
 
@@ -308,20 +457,58 @@ class RouterActor(BaseActor):
 
 
 # Utility functions for actor management
-async def start_multiple_actors(actors: list[BaseActor]) -> None:
-    """Start multiple actors concurrently."""
-    tasks: list[asyncio.Task[None]] = [asyncio.create_task(actor.start()) for actor in actors]
-    await asyncio.gather(*tasks)
+def install_uvloop() -> bool:
+    """
+    Use uvloop for event loops created from now on, if it is installed.
+
+    Must be called before asyncio.run(); the loop that is already running is
+    not replaced.
+
+    Returns:
+        True if the uvloop policy was installed, False if uvloop is unavailable
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return False
+
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
 
 
-async def stop_multiple_actors(actors: list[BaseActor]) -> None:
-    """Stop multiple actors concurrently."""
-    tasks: list[asyncio.Task[None]] = [asyncio.create_task(actor.stop()) for actor in actors]
+async def _run_bounded(coros: List[Coroutine[Any, Any, None]], max_concurrency: int) -> None:
+    """Run coroutines concurrently with at most max_concurrency in flight."""
+    semaphore: asyncio.Semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _bounded(coro: Coroutine[Any, Any, None]) -> None:
+        async with semaphore:
+            await coro
+
+    tasks: list[asyncio.Task[None]] = [asyncio.create_task(_bounded(coro)) for coro in coros]
     await asyncio.gather(*tasks)
 
 
+async def start_multiple_actors(actors: list[BaseActor], max_concurrency: int = 16) -> None:
+    """Start multiple actors concurrently, bounding simultaneous NATS connects."""
+    await _run_bounded([actor.start() for actor in actors], max_concurrency)
+
+
+async def stop_multiple_actors(actors: list[BaseActor], max_concurrency: int = 16) -> None:
+    """Stop multiple actors concurrently, bounding simultaneous connection closes."""
+    await _run_bounded([actor.stop() for actor in actors], max_concurrency)
+
+
 async def run_actors_forever(actors: list[BaseActor]) -> None:
     """Run actors until interrupted."""
+    # Eager tasks run message handlers inline until their first real suspension,
+    # so fast-path messages (wrong actor, malformed data) skip a scheduling round-trip.
+    # Only available on Python 3.12+; an already installed factory is left alone.
+    loop = asyncio.get_running_loop()
+    eager_task_factory = getattr(asyncio, "eager_task_factory", None)
+    install_factory: bool = eager_task_factory is not None and loop.get_task_factory() is None
+    if install_factory:
+        loop.set_task_factory(eager_task_factory)
+
     try:
         await start_multiple_actors(actors)
 
@@ -333,3 +520,5 @@ async def run_actors_forever(actors: list[BaseActor]) -> None:
         logging.info("Received interrupt signal, shutting down...")
     finally:
         await stop_multiple_actors(actors)
+        if install_factory:
+            loop.set_task_factory(None)
@@ -12,12 +12,53 @@ For ML-based analysis, see sentiment_analyzer_ml.py.
 import asyncio
 import logging
 import re
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Dict, List, Optional, Set, Tuple
 from datetime import datetime, timezone
 
 from actors.base import BaseActor
 from models.message import MessagePayload
 
+# Keyword categories located by SentimentAnalyzer._scan()
+_KEYWORD_CATEGORIES = ("sentiment", "urgency", "complaint", "escalation", "intensifier", "negation")
+
+# Patterns are compiled once at import; each matching pattern adds to the analyzer's score
+_WORD_PATTERN = re.compile(r'\b\w+\b')
+
+_URGENCY_PATTERNS = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'\b(today|tonight|this\s+week)\b',
+    r'\b(expires?|expire)\s+(today|tomorrow|soon)\b',
+    r'\b(need|want|require).{0,20}(immediately|asap|urgently)\b',
+    r'\b(time\s+sensitive|time-sensitive)\b',
+    r'\b(deadline|due\s+date)\b',
+    r'\b(supposed\s+to\s+(arrive|come|be\s+here))\s+(yesterday|today)\b',
+    r'\b(should\s+have\s+(arrived|come|been\s+here))\b',
+    r'\b(was\s+(supposed|expected))\s+to\b'
+))
+
+_COMPLAINT_PATTERNS = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'\b(i\s+want\s+to\s+complain|file\s+a\s+complaint)\b',
+    r'\b(this\s+is\s+(terrible|awful|horrible))\b',
+    r'\b(not\s+satisfied|unsatisfied|disappointed)\b',
+    r'\b(want\s+(refund|money\s+back|return))\b',
+    r'\b(something\s+is\s+wrong|there\s+is\s+a\s+problem)\b',
+    r'\b(very\s+(frustrated|angry|upset))\b'
+))
+
+# Only whether any of these matches matters, so they share one alternation
+_POSITIVE_CONTEXT_PATTERN = re.compile(
+    r'\b(thank\s+you|thanks|grateful|appreciate)\b'
+    r'|\b(excellent|wonderful|great|amazing|fantastic)\b'
+    r'|\b(happy|pleased|satisfied|love)\b',
+    re.IGNORECASE
+)
+
+_ESCALATION_PATTERNS = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'\b(speak\s+to\s+(your\s+)?(manager|supervisor))\b',
+    r'\b(this\s+is\s+unacceptable)\b',
+    r'\b(i\s+will\s+(sue|report|review))\b',
+    r'\b(terrible\s+service|worst\s+experience)\b'
+))
+
 
 class SentimentAnalyzer(BaseActor):
     """
@@ -101,19 +142,63 @@ class SentimentAnalyzer(BaseActor):
             "hasn't", "hadn't"
         }
 
+        # Keyword -> categories index built from the sets above, so a single pass over
+        # the tokens finds every kind of keyword. Rebuild it if the sets are changed.
+        self._keyword_categories = self._build_keyword_index()
+
+        # Tokens and keyword hits of the last scanned text, shared by the analyzers
+        self._last_scan: Optional[Tuple[str, List[str], Dict[str, List[int]]]] = None
+
+    def _build_keyword_index(self) -> Dict[str, Tuple[str, ...]]:
+        """Map every keyword to the categories it belongs to."""
+        category_words = {
+            "sentiment": self.positive_words | self.negative_words,
+            "urgency": self.urgency_words,
+            "complaint": self.complaint_words,
+            "escalation": self.escalation_words,
+            "intensifier": self.intensifiers,
+            "negation": self.negation_words,
+        }
+        index: Dict[str, Tuple[str, ...]] = {}
+        for category in _KEYWORD_CATEGORIES:
+            for word in category_words[category]:
+                index[word] = index.get(word, ()) + (category,)
+        return index
+
+    def _scan(self, text: str) -> Tuple[List[str], Dict[str, List[int]]]:
+        """Tokenize text and locate every keyword in one pass.
+
+        Returns the lowercased tokens and, for each keyword category, the positions of
+        the matching tokens in order. The last result is kept, so analyzing one message
+        with several analyzers tokenizes it only once.
+        """
+        last_scan = self._last_scan
+        if last_scan is not None and last_scan[0] == text:
+            return last_scan[1], last_scan[2]
+
+        words = _WORD_PATTERN.findall(text.lower())
+        hits: Dict[str, List[int]] = {category: [] for category in _KEYWORD_CATEGORIES}
+        keyword_categories = self._keyword_categories
+        for i, word in enumerate(words):
+            categories = keyword_categories.get(word)
+            if categories:
+                for category in categories:
+                    hits[category].append(i)
+
+        self._last_scan = (text, words, hits)
+        return words, hits
+
     async def process(self, payload: MessagePayload) -> Optional[Dict[str, Any]]:
         """Process message for sentiment analysis."""
         try:
             self.logger.info(f"Processing sentiment analysis for customer: {payload.customer_email}")
 
-            # Extract message content
-            content = payload.customer_message.lower() if payload.customer_message else ""
-
             # Perform analysis
-            sentiment_result = self._analyze_sentiment(content)
-            urgency_result = self._analyze_urgency(content)
-            complaint_result = self._analyze_complaint(content)
-            escalation_result = self._analyze_escalation(content)
+            results = self.analyze_all(payload.customer_message or "")
+            sentiment_result = results["sentiment"]
+            urgency_result = results["urgency"]
+            complaint_result = results["complaint"]
+            escalation_result = results["escalation"]
 
             # Create analysis result
             analysis_result: Dict[str, Any] = {
@@ -156,21 +241,39 @@ class SentimentAnalyzer(BaseActor):
                 "error": str(e)
             }
 
+    def analyze_all(self, message: str) -> Dict[str, Dict[str, Any]]:
+        """Run every analysis on a message, lowercasing and tokenizing it only once.
+
+        Returns the sentiment, urgency, complaint and escalation results keyed by name.
+        """
+        text = message.lower()
+        self._scan(text)
+        return {
+            "sentiment": self._analyze_sentiment(text),
+            "urgency": self._analyze_urgency(text),
+            "complaint": self._analyze_complaint(text),
+            "escalation": self._analyze_escalation(text),
+        }
+
     def _analyze_sentiment(self, text: str) -> Dict[str, Any]:
         """Analyze sentiment using rule-based approach."""
-        words = re.findall(r'\b\w+\b', text.lower())
+        words, hits = self._scan(text)
+        negation_positions = set(hits["negation"])
+        intensifier_positions = set(hits["intensifier"])
 
         positive_score = 0
         negative_score = 0
         found_keywords = []
 
-        # Process words with context
-        for i, word in enumerate(words):
+        # Process sentiment words with context
+        for i in hits["sentiment"]:
+            word = words[i]
+
             # Check for negation in the previous 2 words
-            negated = any(neg in words[max(0, i-2):i] for neg in self.negation_words)
+            negated = i - 1 in negation_positions or i - 2 in negation_positions
 
             # Check for intensifiers in the previous 2 words
-            intensified = any(intens in words[max(0, i-2):i] for intens in self.intensifiers)
+            intensified = i - 1 in intensifier_positions or i - 2 in intensifier_positions
             multiplier = 1.5 if intensified else 1.0
 
             if word in self.positive_words:
@@ -181,7 +284,7 @@ class SentimentAnalyzer(BaseActor):
                     positive_score += score
                 found_keywords.append(word)
 
-            elif word in self.negative_words:
+            else:
                 score = multiplier
                 if negated:
                     positive_score += score
@@ -191,7 +294,7 @@ class SentimentAnalyzer(BaseActor):
 
         # Calculate final sentiment
         total_score = positive_score - negative_score
-        total_words = len([w for w in words if w in self.positive_words or w in self.negative_words])
+        total_words = len(hits["sentiment"])
 
         if total_words == 0:
             return {
@@ -220,30 +323,14 @@ class SentimentAnalyzer(BaseActor):
 
     def _analyze_urgency(self, text: str) -> Dict[str, Any]:
         """Analyze urgency using rule-based approach."""
-        words = re.findall(r'\b\w+\b', text.lower())
+        words, hits = self._scan(text)
 
-        urgency_score = 0
-        found_keywords = []
-
-        for word in words:
-            if word in self.urgency_words:
-                urgency_score += 1
-                found_keywords.append(word)
+        found_keywords = [words[i] for i in hits["urgency"]]
+        urgency_score = len(found_keywords)
 
         # Check for patterns indicating urgency
-        urgency_patterns = [
-            r'\b(today|tonight|this\s+week)\b',
-            r'\b(expires?|expire)\s+(today|tomorrow|soon)\b',
-            r'\b(need|want|require).{0,20}(immediately|asap|urgently)\b',
-            r'\b(time\s+sensitive|time-sensitive)\b',
-            r'\b(deadline|due\s+date)\b',
-            r'\b(supposed\s+to\s+(arrive|come|be\s+here))\s+(yesterday|today)\b',
-            r'\b(should\s+have\s+(arrived|come|been\s+here))\b',
-            r'\b(was\s+(supposed|expected))\s+to\b'
-        ]
-
-        for pattern in urgency_patterns:
-            if re.search(pattern, text, re.IGNORECASE):
+        for pattern in _URGENCY_PATTERNS:
+            if pattern.search(text):
                 urgency_score += 2
 
         # Determine urgency level
@@ -262,40 +349,21 @@ class SentimentAnalyzer(BaseActor):
 
     def _analyze_complaint(self, text: str) -> Dict[str, Any]:
         """Analyze if message is a complaint."""
-        words = re.findall(r'\b\w+\b', text.lower())
+        words, hits = self._scan(text)
 
         complaint_score = 0
-        found_keywords = []
 
         # Check for explicit complaint patterns first (higher weight)
-        complaint_patterns = [
-            r'\b(i\s+want\s+to\s+complain|file\s+a\s+complaint)\b',
-            r'\b(this\s+is\s+(terrible|awful|horrible))\b',
-            r'\b(not\s+satisfied|unsatisfied|disappointed)\b',
-            r'\b(want\s+(refund|money\s+back|return))\b',
-            r'\b(something\s+is\s+wrong|there\s+is\s+a\s+problem)\b',
-            r'\b(very\s+(frustrated|angry|upset))\b'
-        ]
-
-        for pattern in complaint_patterns:
-            if re.search(pattern, text, re.IGNORECASE):
+        for pattern in _COMPLAINT_PATTERNS:
+            if pattern.search(text):
                 complaint_score += 3
 
         # Check for positive context that should reduce complaint threshold
-        positive_context_patterns = [
-            r'\b(thank\s+you|thanks|grateful|appreciate)\b',
-            r'\b(excellent|wonderful|great|amazing|fantastic)\b',
-            r'\b(happy|pleased|satisfied|love)\b'
-        ]
-
-        has_strong_positive_context = any(re.search(pattern, text, re.IGNORECASE)
-                                         for pattern in positive_context_patterns)
+        has_strong_positive_context = _POSITIVE_CONTEXT_PATTERN.search(text) is not None
 
         # Check individual complaint words
-        for word in words:
-            if word in self.complaint_words:
-                complaint_score += 1
-                found_keywords.append(word)
+        found_keywords = [words[i] for i in hits["complaint"]]
+        complaint_score += len(found_keywords)
 
         # Adjust threshold based on context:
         # - Strong positive context (thank you, excellent, etc.) requires more complaint signals
@@ -317,26 +385,14 @@ class SentimentAnalyzer(BaseActor):
 
     def _analyze_escalation(self, text: str) -> Dict[str, Any]:
         """Analyze if escalation is needed."""
-        words = re.findall(r'\b\w+\b', text.lower())
+        words, hits = self._scan(text)
 
-        escalation_score = 0
-        found_keywords = []
-
-        for word in words:
-            if word in self.escalation_words:
-                escalation_score += 1
-                found_keywords.append(word)
+        found_keywords = [words[i] for i in hits["escalation"]]
+        escalation_score = len(found_keywords)
 
         # Check for escalation patterns
-        escalation_patterns = [
-            r'\b(speak\s+to\s+(your\s+)?(manager|supervisor))\b',
-            r'\b(this\s+is\s+unacceptable)\b',
-            r'\b(i\s+will\s+(sue|report|review))\b',
-            r'\b(terrible\s+service|worst\s+experience)\b'
-        ]
-
-        for pattern in escalation_patterns:
-            if re.search(pattern, text, re.IGNORECASE):
+        for pattern in _ESCALATION_PATTERNS:
+            if pattern.search(text):
                 escalation_score += 3
 
         escalation_needed = escalation_score >= 3
@@ -72,6 +72,9 @@ class MockCustomerAPI:
         self.orders: Dict[str, List[CustomerOrder]] = {}
         self.support_history: Dict[str, List[CustomerSupport]] = {}
 
+        # Secondary index over the same profiles, keyed by customer_id
+        self._customers_by_id: Dict[str, CustomerProfile] = {}
+
         # Initialize with sample data
         self._initialize_mock_data()
 
@@ -129,6 +132,7 @@ class MockCustomerAPI:
             )
 
             self.customers[customer.email] = customer
+            self._customers_by_id[customer_id] = customer
 
             # Create sample orders
             self._create_sample_orders(customer_id, customer.email)
@@ -273,16 +277,15 @@ class MockCustomerAPI:
         # Simulate API delay
         await asyncio.sleep(0.1)
 
-        # Find customer by ID
-        for customer in self.customers.values():
-            if customer.customer_id == customer_id:
-                old_tier = customer.tier
-                customer.tier = new_tier
-                self.logger.info(f"Updated customer {customer_id} tier from {old_tier} to {new_tier}")
-                return True
+        customer = self._customers_by_id.get(customer_id)
+        if customer is None:
+            self.logger.warning(f"Customer not found for tier update: {customer_id}")
+            return False
 
-        self.logger.warning(f"Customer not found for tier update: {customer_id}")
-        return False
+        old_tier = customer.tier
+        customer.tier = new_tier
+        self.logger.info(f"Updated customer {customer_id} tier from {old_tier} to {new_tier}")
+        return True
 
     async def add_customer_note(self, customer_id: str, note: str, agent_id: str = "SYSTEM") -> bool:
         """Add a note to customer's support history."""
@@ -5,11 +5,68 @@ This module implements the message structure used for communication between
 actors in the e-commerce support agent system.
 """
 
-import uuid
+import itertools
+import os
+import secrets
+import time
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from typing import Any, Dict, Final, List, Optional, Tuple, Union
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
+
+# Message ids are a counter starting at a random offset, followed by a random
+# per-process suffix: unique across processes and hosts without paying for a
+# UUID (and urandom call) per message. The counter goes first because the
+# escalation router shows customers the first 8 characters as a reference ID.
+_id_suffix: str = secrets.token_hex(8)
+_id_counter = itertools.count(secrets.randbits(32))
+
+
+def _reseed_ids() -> None:
+    """Give a forked child its own id suffix so it can't repeat the parent's ids."""
+    global _id_suffix, _id_counter
+    _id_suffix = secrets.token_hex(8)
+    _id_counter = itertools.count(secrets.randbits(32))
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reseed_ids)
+
+
+def _fast_id() -> str:
+    """Generate a unique message id."""
+    return f"{next(_id_counter) & 0xFFFFFFFF:08x}-{_id_suffix}"
+
+
+@lru_cache(maxsize=1)
+def _iso_for_second(second: int) -> str:
+    """Format a Unix timestamp in whole seconds as a UTC ISO 8601 string."""
+    return datetime.fromtimestamp(second, timezone.utc).isoformat()
+
+
+def _now_iso() -> str:
+    """Current UTC time as an ISO 8601 string, formatted at most once per second."""
+    return _iso_for_second(int(time.time()))
+
+
+@lru_cache(maxsize=128)
+def _subject_for(actor_name: str) -> str:
+    """NATS subject of an actor's mailbox, built once per actor name."""
+    return f"ecommerce.support.{actor_name}"
+
+
+# Most recent errors kept in MessagePayload.recovery_log by Message.add_error()
+MAX_RECOVERY_LOG = 16
+
+
+def _add_metadata_defaults(metadata: Dict[str, Any]) -> Dict[str, Any]:
+    """Add the creation timestamp and retry counter to message metadata if missing."""
+    if "created_at" not in metadata:
+        metadata["created_at"] = _now_iso()
+    if "retry_count" not in metadata:
+        metadata["retry_count"] = 0
+    return metadata
 
 
 class Route(BaseModel):
@@ -68,19 +125,26 @@ class MessagePayload(BaseModel):
 class Message(BaseModel):
     """Main message structure for actor communication."""
 
-    message_id: str = Field(default_factory=lambda: str(uuid.uuid4()), description="Unique message identifier")
+    message_id: str = Field(default_factory=_fast_id, description="Unique message identifier")
     session_id: str = Field(description="Conversation session identifier")
     route: Route = Field(description="Routing information")
     payload: MessagePayload = Field(description="Message content")
     metadata: Dict[str, Any] = Field(default_factory=dict, description="Message metadata")
 
-    def __init__(self, **data):
-        super().__init__(**data)
-        # Add creation timestamp
-        if "created_at" not in self.metadata:
-            self.metadata["created_at"] = datetime.now(timezone.utc).isoformat()
-        if "retry_count" not in self.metadata:
-            self.metadata["retry_count"] = 0
+    @model_validator(mode="after")
+    def _set_metadata_defaults(self) -> "Message":
+        # Runs for every validating construction path, including model_validate_json()
+        _add_metadata_defaults(self.metadata)
+        return self
+
+    @classmethod
+    def from_wire(cls, raw: Union[bytes, str]) -> "Message":
+        """Parse and validate a message received from NATS in a single pydantic-core pass."""
+        return cls.model_validate_json(raw)
+
+    def to_wire(self) -> bytes:
+        """Serialize the message to JSON bytes for NATS."""
+        return self.model_dump_json().encode()
 
     def add_enrichment(self, field: str, data: Dict[str, Any]) -> None:
         """Add enrichment data to the payload."""
@@ -92,19 +156,54 @@ class Message(BaseModel):
             "type": error_type,
             "message": error_message,
             "actor": actor,
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "timestamp": _now_iso(),
         }
         self.payload.error = error_info
-        self.payload.recovery_log.append(error_info)
+
+        # The log keeps its own copy so later edits to payload.error don't rewrite history
+        recovery_log = self.payload.recovery_log
+        if len(recovery_log) >= MAX_RECOVERY_LOG:
+            del recovery_log[: len(recovery_log) - MAX_RECOVERY_LOG + 1]
+        recovery_log.append(dict(error_info))
 
     def increment_retry(self) -> None:
         """Increment retry counter."""
         self.metadata["retry_count"] += 1
-        self.metadata["last_retry_at"] = datetime.now(timezone.utc).isoformat()
+        self.metadata["last_retry_at"] = _now_iso()
 
     def to_nats_subject(self, actor_name: str) -> str:
         """Generate NATS subject for the given actor."""
-        return f"ecommerce.support.{actor_name}"
+        return _subject_for(actor_name)
+
+
+# Step lists of the standard routes; each factory call copies one into a new Route.
+# The copy is required: DecisionRouter inserts steps into a message's route in place.
+_COMPLAINT_ANALYSIS_STEPS: Final[Tuple[str, ...]] = (
+    "sentiment_analyzer",
+    "intent_analyzer",
+    "context_retriever",
+    "decision_router",
+)
+_RESPONSE_GENERATION_STEPS: Final[Tuple[str, ...]] = (
+    "response_generator",
+    "guardrail_validator",
+    "response_aggregator",
+)
+_ACTION_EXECUTION_STEPS: Final[Tuple[str, ...]] = ("execution_coordinator", "response_aggregator")
+_FULL_SUPPORT_STEPS: Final[Tuple[str, ...]] = (
+    "sentiment_analyzer",
+    "intent_analyzer",
+    "context_retriever",
+    "decision_router",
+    "response_generator",
+    "guardrail_validator",
+    "response_aggregator",
+)
+
+
+def _standard_route(steps: Tuple[str, ...]) -> Route:
+    """Build a fresh route from a known-good step list, without validation."""
+    return Route.model_construct(steps=list(steps), current_step=0, error_handler="escalation_router")
 
 
 # Standard routes for different message flows
@@ -112,74 +211,62 @@ class StandardRoutes:
     """Predefined routes for common workflows."""
 
     # Complete processing pipeline for API Gateway
-    FULL_PROCESSING_PIPELINE = [
-        "sentiment_analyzer",
-        "intent_analyzer",
-        "context_retriever",
-        "decision_router",
-        "response_generator",
-        "guardrail_validator",
-        "response_aggregator",
-    ]
+    FULL_PROCESSING_PIPELINE = list(_FULL_SUPPORT_STEPS)
 
     @staticmethod
     def complaint_analysis_route() -> Route:
         """Route for analyzing customer complaints."""
-        return Route(
-            steps=["sentiment_analyzer", "intent_analyzer", "context_retriever", "decision_router"],
-            error_handler="escalation_router",
-        )
+        return _standard_route(_COMPLAINT_ANALYSIS_STEPS)
 
     @staticmethod
     def response_generation_route() -> Route:
         """Route for generating and validating responses."""
-        return Route(
-            steps=["response_generator", "guardrail_validator", "response_aggregator"],
-            error_handler="escalation_router",
-        )
+        return _standard_route(_RESPONSE_GENERATION_STEPS)
 
     @staticmethod
     def action_execution_route() -> Route:
         """Route for executing approved actions."""
-        return Route(steps=["execution_coordinator", "response_aggregator"], error_handler="escalation_router")
+        return _standard_route(_ACTION_EXECUTION_STEPS)
 
     @staticmethod
     def full_support_flow() -> Route:
         """Complete support flow from analysis to response."""
-        return Route(
-            steps=[
-                "sentiment_analyzer",
-                "intent_analyzer",
-                "context_retriever",
-                "decision_router",
-                "response_generator",
-                "guardrail_validator",
-                "response_aggregator",
-            ],
-            error_handler="escalation_router",
-        )
+        return _standard_route(_FULL_SUPPORT_STEPS)
 
 
 # Message factory functions
+# The arguments are already typed values, so the models are built with
+# model_construct() and skip pydantic validation.
 def create_support_message(customer_message: str, customer_email: str, session_id: str, route: Route) -> Message:
     """Create a new support message."""
-    payload = MessagePayload(customer_message=customer_message, customer_email=customer_email)
-
-    return Message(session_id=session_id, route=route, payload=payload)
+    payload = MessagePayload.model_construct(customer_message=customer_message, customer_email=customer_email)
+
+    return Message.model_construct(
+        message_id=_fast_id(),
+        session_id=session_id,
+        route=route,
+        payload=payload,
+        metadata=_add_metadata_defaults({}),
+    )
 
 
 def create_error_message(original_message: Message, error_type: str, error_message: str, actor: str) -> Message:
     """Create an error message from a failed message."""
-    error_msg = Message(
+    error_msg = Message.model_construct(
+        message_id=_fast_id(),
         session_id=original_message.session_id,
-        route=Route(
-            steps=[original_message.route.error_handler]
-            if original_message.route.error_handler
-            else ["escalation_router"],
+        route=Route.model_construct(
+            steps=(
+                [original_message.route.error_handler]
+                if original_message.route.error_handler
+                else ["escalation_router"]
+            ),
             current_step=0,
         ),
+        # The payload is shared, not copied: the original is not processed further.
+        # Metadata is copied so the two messages keep separate retry counters.
         payload=original_message.payload,
-        metadata=original_message.metadata.copy(),
+        metadata=_add_metadata_defaults(original_message.metadata.copy()),
     )
 
     error_msg.add_error(error_type, error_message, actor)
@@ -13,6 +13,7 @@ import sys
 from typing import List
 
 # Import all the actor classes
+from actors.base import install_uvloop
 from actors.sentiment_analyzer import SentimentAnalyzer
 from actors.intent_analyzer import IntentAnalyzer
 from actors.context_retriever import ContextRetriever
@@ -121,6 +122,9 @@ async def main():
         sys.exit(1)
 
 if __name__ == "__main__":
+    if install_uvloop():
+        logger.info("Using uvloop event loop")
+
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
@@ -24,14 +24,6 @@ from models.message import Message, MessagePayload, Route, StandardRoutes, creat
 
 
 # Test Configuration
-@pytest.fixture(scope="session")
-def event_loop():
-    """Create an instance of the default event loop for the test session."""
-    loop = asyncio.get_event_loop_policy().new_event_loop()
-    yield loop
-    loop.close()
-
-
 @pytest.fixture
 def temp_dir():
     """Create a temporary directory for test files."""
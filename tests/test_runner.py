@@ -9,24 +9,110 @@ metrics, and coverage analysis.
 
 import argparse
 import asyncio
+import contextlib
+import functools
+import hashlib
+import io
+import json
+import os
+import re
 import subprocess
 import sys
+import tempfile
 import time
+import traceback
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Add project root to Python path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
+# Matches the counts and duration on pytest's final status line,
+# e.g. "10 passed, 2 failed, 1 skipped, 1 error in 5.23s"
+_SUMMARY_RE = re.compile(r"(\d+)\s+(passed|failed|skipped|errors?)|in\s+([\d.]+)s")
+
+# Amount of raw pytest output kept once the JSON report has been loaded
+_OUTPUT_TAIL_CHARS = 2048
+
+# pytest's exit status when no tests were collected
+_NO_TESTS_COLLECTED = 5
+
+# Records the source fingerprint each quality tool last passed on
+_QUALITY_CACHE_FILE = ".quality_cache.json"
+
+# Project-root config files the quality tools read; changing one invalidates their cached results
+_QUALITY_CONFIG_FILES = ("pyproject.toml", "setup.cfg", "tox.ini", ".flake8", "mypy.ini", ".mypy.ini")
+
+
+def _load_json_file(path: Path) -> Any:
+    """Load a JSON file, using orjson when it is installed."""
+    if orjson is not None:
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
+
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def _dump_json_file(data: Any, path: Path) -> None:
+    """Write data as indented JSON, using orjson when it is installed."""
+    if orjson is not None:
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        return
+
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2)
+
+
+@contextlib.contextmanager
+def _working_directory(path: Path) -> Iterator[None]:
+    """Temporarily change the working directory of the runner process."""
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+@functools.lru_cache(maxsize=32)
+def _render_banner(title: str, char: str, width: int) -> str:
+    """Render a centered banner as a single string."""
+    bar = char * width
+    return f"\n{bar}\n{title:^{width}}\n{bar}\n"
+
+
+@functools.lru_cache(maxsize=32)
+def _render_section(title: str, char: str, width: int) -> str:
+    """Render a section header as a single string."""
+    bar = char * width
+    return f"\n{bar}\n {title}\n{bar}\n"
+
 
 class TestRunner:
     """Main test runner class."""
 
-    def __init__(self, verbose: bool = False, coverage: bool = False):
+    def __init__(
+        self,
+        verbose: bool = False,
+        coverage: bool = False,
+        incremental: bool = False,
+        testmon_noselect: bool = False,
+        in_process: bool = False,
+    ):
         """Initialize the test runner."""
         self.verbose = verbose
+        self.in_process = in_process
         self.coverage = coverage
+        self.incremental = incremental
+        self.testmon_noselect = testmon_noselect
         self.project_root = project_root
         self.test_dir = self.project_root / "tests"
 
@@ -49,36 +135,39 @@ class TestRunner:
 
         self.detailed_results = {}
 
+        # mypy is CPU-bound, so concurrent quality tools are capped at the number of cores
+        self._tool_semaphore = asyncio.Semaphore(os.cpu_count() or 1)
+
     def print_banner(self, title: str, char: str = "=", width: int = 80):
         """Print a formatted banner."""
-        print(f"\n{char * width}")
-        print(f"{title:^{width}}")
-        print(f"{char * width}")
+        sys.stdout.write(_render_banner(title, char, width))
+        sys.stdout.flush()
 
     def print_section(self, title: str, char: str = "-", width: int = 60):
         """Print a section header."""
-        print(f"\n{char * width}")
-        print(f" {title}")
-        print(f"{char * width}")
+        sys.stdout.write(_render_section(title, char, width))
+        sys.stdout.flush()
 
     def check_dependencies(self) -> bool:
         """Check if all required dependencies are available."""
         self.print_section("Checking Dependencies")
 
         required_packages = [
-            "pytest",
-            "pytest-asyncio",
-            "pytest-cov" if self.coverage else None,
+            ("pytest", "pytest"),
+            ("pytest-asyncio", "pytest_asyncio"),
+            ("pytest-cov", "pytest_cov") if self.coverage else None,
+            ("pytest-testmon", "testmon") if self.incremental else None,
         ]
 
         missing_packages = []
 
-        for package in required_packages:
-            if package is None:
+        for entry in required_packages:
+            if entry is None:
                 continue
 
+            package, module = entry
             try:
-                __import__(package.replace("-", "_"))
+                __import__(module)
                 print(f"✓ {package} is available")
             except ImportError:
                 missing_packages.append(package)
@@ -135,25 +224,34 @@ class TestRunner:
         else:
             cmd.append("-q")
 
-        # Add coverage if requested
+        # Add coverage if requested; per-module percentages are printed by generate_coverage_report.
+        # Each category gets its own report, removed first so a failed run can't leave an old one behind.
         if self.coverage:
+            coverage_file = self.coverage_file(test_path.name)
+            coverage_file.unlink(missing_ok=True)
             cmd.extend(
                 [
                     "--cov=actors",
                     "--cov=models",
                     "--cov=storage",
                     "--cov=mock_services",
-                    "--cov-report=term-missing",
-                    "--cov-report=json",
+                    f"--cov-report=json:{coverage_file}",
                 ]
             )
 
+        # Only run tests affected by changes since the last run; testmon keeps its map in .testmondata
+        if self.incremental:
+            cmd.append("--testmon-noselect" if self.testmon_noselect else "--testmon")
+
         # Add any additional arguments
         if additional_args:
             cmd.extend(additional_args)
 
-        # Add JSON reporting for detailed results
-        cmd.extend(["--tb=short", "--json-report", "--json-report-file=/tmp/pytest_report.json"])
+        # Add JSON reporting for detailed results; each session gets its own report file
+        report_fd, report_name = tempfile.mkstemp(prefix="pytest-", suffix=".json")
+        os.close(report_fd)
+        report_path = Path(report_name)
+        cmd.extend(["--tb=short", "--json-report", f"--json-report-file={report_path}"])
 
         if self.verbose:
             print(f"Running command: {' '.join(cmd)}")
@@ -161,31 +259,57 @@ class TestRunner:
         # Run the command
         start_time = time.time()
         try:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                cwd=self.project_root,
-                timeout=300,  # 5 minute timeout
-            )
+            if self.in_process:
+                return_code, output = self.run_pytest_in_process(cmd[3:])
+            else:
+                result = subprocess.run(
+                    cmd,
+                    capture_output=True,
+                    text=True,
+                    cwd=self.project_root,
+                    timeout=300,  # 5 minute timeout
+                )
+                return_code, output = result.returncode, result.stdout + result.stderr
             duration = time.time() - start_time
 
             # Try to load JSON report for detailed results
             detailed_results = {}
             try:
-                import json
-
-                with open("/tmp/pytest_report.json", "r") as f:
-                    detailed_results = json.load(f)
+                detailed_results = _load_json_file(report_path)
             except Exception:
                 pass
 
-            return result.returncode, result.stdout + result.stderr, detailed_results
+            if self.verbose:
+                print(f"\n{test_path.name.capitalize()} Test Output:")
+                print(output)
+
+            # The JSON report carries the statistics, so only a short tail of the log is kept
+            if detailed_results:
+                output = output[-_OUTPUT_TAIL_CHARS:]
+
+            return return_code, output, detailed_results
 
         except subprocess.TimeoutExpired:
             return -1, "Test execution timed out after 5 minutes", {}
         except Exception as e:
             return -1, f"Error running tests: {e}", {}
+        finally:
+            report_path.unlink(missing_ok=True)
+
+    def run_pytest_in_process(self, args: List[str]) -> Tuple[int, str]:
+        """Run pytest inside this interpreter, capturing its output like a subprocess would.
+
+        pytest supports only one pytest.main() session per process, so this is used
+        only when a single test category runs. There is no timeout on this path.
+        """
+        import pytest
+
+        buffer = io.StringIO()
+        with _working_directory(self.project_root):
+            with contextlib.redirect_stdout(buffer), contextlib.redirect_stderr(buffer):
+                return_code = int(pytest.main(args))
+
+        return return_code, buffer.getvalue()
 
     def parse_pytest_output(self, output: str, detailed_results: Dict) -> Dict:
         """Parse pytest output to extract test statistics."""
@@ -202,40 +326,28 @@ class TestRunner:
             stats["duration"] = detailed_results.get("duration", 0.0)
             return stats
 
-        # Fallback to parsing text output
-        lines = output.split("\n")
-        for line in lines:
-            line = line.strip()
-
-            # Look for summary line
-            if "passed" in line or "failed" in line or "error" in line:
-                # Parse patterns like "10 passed, 2 failed, 1 skipped in 5.23s"
-                parts = line.split()
-                for i, part in enumerate(parts):
-                    if part.isdigit():
-                        count = int(part)
-                        if i + 1 < len(parts):
-                            status = parts[i + 1].rstrip(",")
-                            if status in stats:
-                                stats[status] = count
-                            elif status == "passed":
-                                stats["passed"] = count
-                            elif status == "failed":
-                                stats["failed"] = count
-                            elif status == "skipped":
-                                stats["skipped"] = count
-                            elif status == "error" or status == "errors":
-                                stats["errors"] = count
-                    elif "in" in part and i + 1 < len(parts) and "s" in parts[i + 1]:
-                        try:
-                            duration_str = parts[i + 1].rstrip("s")
-                            stats["duration"] = float(duration_str)
-                        except ValueError:
-                            pass
+        # Fallback to parsing text output; the status line is always near EOF
+        tail = "\n".join(output.splitlines()[-5:])
+        for match in _SUMMARY_RE.finditer(tail):
+            count, status, duration = match.groups()
+            if duration is not None:
+                try:
+                    stats["duration"] = float(duration)
+                except ValueError:
+                    pass
+            elif status.startswith("error"):
+                stats["errors"] = int(count)
+            else:
+                stats[status] = int(count)
 
         stats["total"] = stats["passed"] + stats["failed"] + stats["skipped"] + stats["errors"]
         return stats
 
+    def collected_test_files(self, detailed_results: Dict) -> List[str]:
+        """List the test files pytest collected, taken from the JSON report."""
+        files = dict.fromkeys(test["nodeid"].split("::")[0] for test in detailed_results.get("tests", []))
+        return [Path(f).name for f in files]
+
     def run_unit_tests(self) -> bool:
         """Run all unit tests."""
         self.print_section("Running Unit Tests")
@@ -245,22 +357,19 @@ class TestRunner:
             print("✗ Unit test directory not found")
             return False
 
-        # Find all test files
-        test_files = list(unit_test_dir.glob("test_*.py"))
-        if not test_files:
-            print("✗ No unit test files found")
-            return False
-
-        print(f"Found {len(test_files)} unit test files:")
-        for test_file in test_files:
-            print(f"  - {test_file.name}")
+        print(f"Collecting tests from {unit_test_dir.relative_to(self.project_root)}...")
 
         # Run unit tests
         return_code, output, detailed = self.run_pytest_command(unit_test_dir)
+        if return_code == _NO_TESTS_COLLECTED:
+            print("✗ No unit tests found")
+            return False
 
-        if self.verbose:
-            print("\nUnit Test Output:")
-            print(output)
+        test_files = self.collected_test_files(detailed)
+        if test_files:
+            print(f"Ran tests from {len(test_files)} unit test files:")
+            for test_file in test_files:
+                print(f"  - {test_file}")
 
         # Parse results
         stats = self.parse_pytest_output(output, detailed)
@@ -297,22 +406,19 @@ class TestRunner:
             print("! Integration test directory not found - skipping")
             return True
 
-        # Find integration test files
-        test_files = list(integration_test_dir.glob("test_*.py"))
-        if not test_files:
-            print("! No integration test files found - skipping")
-            return True
-
-        print(f"Found {len(test_files)} integration test files:")
-        for test_file in test_files:
-            print(f"  - {test_file.name}")
+        print(f"Collecting tests from {integration_test_dir.relative_to(self.project_root)}...")
 
         # Run integration tests
         return_code, output, detailed = self.run_pytest_command(integration_test_dir)
+        if return_code == _NO_TESTS_COLLECTED:
+            print("! No integration tests found - skipping")
+            return True
 
-        if self.verbose:
-            print("\nIntegration Test Output:")
-            print(output)
+        test_files = self.collected_test_files(detailed)
+        if test_files:
+            print(f"Ran tests from {len(test_files)} integration test files:")
+            for test_file in test_files:
+                print(f"  - {test_file}")
 
         # Parse results
         stats = self.parse_pytest_output(output, detailed)
@@ -381,7 +487,37 @@ class TestRunner:
             print(f"✗ Basic flow validation ERROR: {e}")
             return False
 
-    def check_code_quality(self) -> bool:
+    def quality_fingerprint(self, dir_paths: List[Path]) -> str:
+        """Fingerprint the sources and config the quality tools look at."""
+        digest = hashlib.sha256()
+        inputs = [self.project_root / name for name in _QUALITY_CONFIG_FILES]
+        for dir_path in dir_paths:
+            inputs.extend(sorted(dir_path.rglob("*.py")))
+
+        for path in inputs:
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            digest.update(f"{path.relative_to(self.project_root)}:{st.st_size}:{st.st_mtime_ns}\n".encode())
+
+        return digest.hexdigest()
+
+    async def run_tool(self, cmd: List[str], timeout: float) -> Tuple[int, str]:
+        """Run a quality tool without blocking the event loop."""
+        async with self._tool_semaphore:
+            proc = await asyncio.create_subprocess_exec(
+                *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+            )
+            try:
+                stdout, _ = await asyncio.wait_for(proc.communicate(), timeout)
+            except asyncio.TimeoutError:
+                proc.kill()
+                await proc.wait()
+                raise
+            return proc.returncode, stdout.decode(errors="replace")
+
+    async def check_code_quality(self) -> bool:
         """Run code quality checks if tools are available."""
         self.print_section("Code Quality Checks")
 
@@ -392,63 +528,85 @@ class TestRunner:
             ("mypy", "Type checking"),
         ]
 
+        # Run tools on key directories
+        target_dirs = ["actors", "models", "storage", "mock_services"]
+        dir_paths = [self.project_root / d for d in target_dirs if (self.project_root / d).exists()]
+
+        # Tools that passed on identical sources, config and tool version last time are not run again
+        fingerprint = self.quality_fingerprint(dir_paths)
+        cache_file = self.project_root / _QUALITY_CACHE_FILE
+        try:
+            quality_cache = _load_json_file(cache_file)
+        except Exception:
+            quality_cache = {}
+
+        probes = await asyncio.gather(
+            *(self.run_tool([tool, "--version"], timeout=10) for tool, _ in tools_to_check), return_exceptions=True
+        )
+
         available_tools = []
-        for tool, description in tools_to_check:
-            try:
-                result = subprocess.run([tool, "--version"], capture_output=True, timeout=10)
-                if result.returncode == 0:
-                    available_tools.append((tool, description))
-                    print(f"✓ {description} ({tool}) is available")
-                else:
-                    print(f"! {description} ({tool}) is not available")
-            except (subprocess.TimeoutExpired, FileNotFoundError):
+        tool_keys: Dict[str, str] = {}
+        for (tool, description), probe in zip(tools_to_check, probes):
+            if isinstance(probe, BaseException) or probe[0] != 0:
                 print(f"! {description} ({tool}) is not available")
+                continue
 
-        if not available_tools:
-            print("! No code quality tools available - skipping")
+            tool_keys[tool] = hashlib.sha256(f"{fingerprint}\n{probe[1]}".encode()).hexdigest()
+            if quality_cache.get(tool) == tool_keys[tool]:
+                print(f"✓ {description} ({tool}) passed on unchanged sources - cached")
+            else:
+                available_tools.append((tool, description))
+                print(f"✓ {description} ({tool}) is available")
+
+        if not available_tools or not dir_paths:
+            print("! No code quality tools to run - skipping")
             return True
 
-        # Run available tools on key directories
-        target_dirs = ["actors", "models", "storage", "mock_services"]
         all_passed = True
+        dir_names = ", ".join(p.name for p in dir_paths)
+
+        # One invocation per tool over all directories amortizes interpreter startup
+        commands = []
+        for tool, _ in available_tools:
+            if tool == "black":
+                commands.append([tool, "--check", "--diff", *map(str, dir_paths)])
+            else:
+                commands.append([tool, *map(str, dir_paths)])
 
-        for tool, description in available_tools:
+        outcomes = await asyncio.gather(
+            *(self.run_tool(cmd, timeout=30 * len(dir_paths)) for cmd in commands), return_exceptions=True
+        )
+
+        for (tool, description), outcome in zip(available_tools, outcomes):
             print(f"\nRunning {description}...")
 
-            for target_dir in target_dirs:
-                dir_path = self.project_root / target_dir
-                if not dir_path.exists():
-                    continue
+            if isinstance(outcome, asyncio.TimeoutError):
+                print(f"  ! {dir_names} (timeout)")
+                all_passed = False
+            elif isinstance(outcome, BaseException):
+                print(f"  ! {dir_names} (error: {outcome})")
+                all_passed = False
+            elif outcome[0] == 0:
+                print(f"  ✓ {dir_names}")
+                quality_cache[tool] = tool_keys[tool]
+            else:
+                print(f"  ✗ {dir_names}")
+                if self.verbose and outcome[1]:
+                    print(f"    Output: {outcome[1][:200]}")
+                quality_cache.pop(tool, None)
+                all_passed = False
 
-                try:
-                    if tool == "black":
-                        cmd = [tool, "--check", "--diff", str(dir_path)]
-                    elif tool == "flake8":
-                        cmd = [tool, str(dir_path)]
-                    elif tool == "mypy":
-                        cmd = [tool, str(dir_path)]
-                    else:
-                        continue
-
-                    result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-
-                    if result.returncode == 0:
-                        print(f"  ✓ {target_dir}")
-                    else:
-                        print(f"  ✗ {target_dir}")
-                        if self.verbose and result.stdout:
-                            print(f"    Output: {result.stdout[:200]}")
-                        all_passed = False
-
-                except subprocess.TimeoutExpired:
-                    print(f"  ! {target_dir} (timeout)")
-                    all_passed = False
-                except Exception as e:
-                    print(f"  ! {target_dir} (error: {e})")
-                    all_passed = False
+        try:
+            _dump_json_file(quality_cache, cache_file)
+        except Exception as e:
+            print(f"! Could not write quality cache: {e}")
 
         return all_passed
 
+    def coverage_file(self, category: str) -> Path:
+        """Path of the JSON coverage report written by one test category's session."""
+        return self.project_root / f"coverage-{category}.json"
+
     def generate_coverage_report(self) -> Optional[Dict]:
         """Generate coverage report if coverage was enabled."""
         if not self.coverage:
@@ -456,23 +614,34 @@ class TestRunner:
 
         self.print_section("Coverage Report")
 
-        # Check if coverage.json exists
-        coverage_file = self.project_root / "coverage.json"
+        # Only categories that ran in this invocation; their reports were rewritten or removed
+        reports: Dict[str, Dict] = {}
+        for category in self.detailed_results:
+            coverage_data = self.print_category_coverage(category)
+            if coverage_data is not None:
+                reports[category] = coverage_data
+
+        if not reports:
+            print("! No coverage data")
+            return None
+
+        self.results["coverage"] = reports
+        return reports
+
+    def print_category_coverage(self, category: str) -> Optional[Dict]:
+        """Print the coverage report of one test category, if its session wrote one."""
+        coverage_file = self.coverage_file(category)
         if not coverage_file.exists():
-            print("! Coverage data not found")
             return None
 
         try:
-            import json
-
-            with open(coverage_file, "r") as f:
-                coverage_data = json.load(f)
+            coverage_data = _load_json_file(coverage_file)
 
             # Extract summary
             summary = coverage_data.get("totals", {})
             coverage_percent = summary.get("percent_covered", 0)
 
-            print(f"Overall Coverage: {coverage_percent:.1f}%")
+            print(f"\n{category.capitalize()} Coverage: {coverage_percent:.1f}%")
             print(f"Lines Covered: {summary.get('covered_lines', 0)}")
             print(f"Lines Missing: {summary.get('missing_lines', 0)}")
             print(f"Total Lines: {summary.get('num_statements', 0)}")
@@ -487,11 +656,10 @@ class TestRunner:
                     file_percent = file_data.get("summary", {}).get("percent_covered", 0)
                     print(f"  {module_name}: {file_percent:.1f}%")
 
-            self.results["coverage"] = coverage_data
             return coverage_data
 
         except Exception as e:
-            print(f"! Error reading coverage data: {e}")
+            print(f"! Error reading {category} coverage data: {e}")
             return None
 
     def print_final_summary(self):
@@ -506,9 +674,9 @@ class TestRunner:
         print(f"Errors: {self.results['errors']}")
         print(f"Total Duration: {self.results['duration']:.2f}s")
 
-        if self.results["coverage"]:
-            coverage_percent = self.results["coverage"].get("totals", {}).get("percent_covered", 0)
-            print(f"Coverage: {coverage_percent:.1f}%")
+        for category, coverage_data in (self.results["coverage"] or {}).items():
+            coverage_percent = coverage_data.get("totals", {}).get("percent_covered", 0)
+            print(f"{category.capitalize()} Coverage: {coverage_percent:.1f}%")
 
         # Success rate
         if self.results["total_tests"] > 0:
@@ -540,8 +708,6 @@ class TestRunner:
             return
 
         try:
-            import json
-
             output_data = {
                 "timestamp": time.time(),
                 "summary": self.results,
@@ -550,8 +716,7 @@ class TestRunner:
                 "test_categories": {k: str(v) for k, v in self.test_categories.items()},
             }
 
-            with open(output_file, "w") as f:
-                json.dump(output_data, f, indent=2)
+            _dump_json_file(output_data, Path(output_file))
 
             print(f"\n📊 Test results saved to: {output_file}")
 
@@ -579,7 +744,7 @@ class TestRunner:
         # Code quality checks (optional)
         quality_success = True
         if not skip_quality:
-            quality_success = self.check_code_quality()
+            quality_success = await self.check_code_quality()
 
         # Coverage report
         self.generate_coverage_report()
@@ -617,10 +782,36 @@ def main():
 
     parser.add_argument("--integration-only", action="store_true", help="Run only integration tests")
 
+    parser.add_argument(
+        "--incremental", action="store_true", help="Run only tests affected by changes since the last run (testmon)"
+    )
+
+    parser.add_argument(
+        "--testmon-noselect",
+        action="store_true",
+        help="With --incremental, run every test while still refreshing the testmon data",
+    )
+
+    parser.add_argument(
+        "--in-process",
+        action="store_true",
+        help="With --unit-only or --integration-only, run pytest inside the runner (faster start-up, no timeout)",
+    )
+
     args = parser.parse_args()
 
+    # pytest does not support a second pytest.main() session in the same process
+    if args.in_process and not (args.unit_only or args.integration_only):
+        parser.error("--in-process requires --unit-only or --integration-only")
+
     # Create test runner
-    runner = TestRunner(verbose=args.verbose, coverage=args.coverage)
+    runner = TestRunner(
+        verbose=args.verbose,
+        coverage=args.coverage,
+        incremental=args.incremental,
+        testmon_noselect=args.testmon_noselect,
+        in_process=args.in_process,
+    )
 
     try:
         if args.unit_only:
@@ -646,8 +837,6 @@ def main():
     except Exception as e:
         print(f"\n\n❌ Test execution failed with error: {e}")
         if args.verbose:
-            import traceback
-
             traceback.print_exc()
         sys.exit(1)
 
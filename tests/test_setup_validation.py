@@ -6,54 +6,163 @@ This script validates that the test environment is properly configured
 and all dependencies are available before running the full test suite.
 """
 
-import asyncio
+import argparse
+import contextvars
+import functools
+import hashlib
+import importlib.machinery
+import importlib.util
+import json
+import os
 import sys
+from collections import Counter
+from contextvars import ContextVar
 from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# This script lives in tests/; the checks and the stamp are relative to the repository root
+project_root = Path(__file__).parent.parent
+
+# The interpreter version cannot change while the script runs
+_PY_VERSION_OK_MSG = "✅ Python {0.major}.{0.minor}.{0.micro} is compatible".format(sys.version_info)
+_PY_VERSION_BAD_MSG = "❌ Python {0.major}.{0.minor} is not supported. Please use Python 3.8+".format(sys.version_info)
+
+# (importable name, display name) of the third-party packages the test suite needs.
+# asyncio, json and unittest.mock ship with every supported Python and are not probed.
+_REQUIRED_PACKAGES = (
+    ("pytest", "pytest"),
+    ("pytest_asyncio", "pytest-asyncio"),
+    ("pydantic", "pydantic"),
+)
+
+# Files and directories, relative to the project root, that must exist
+_REQUIRED_PATHS = (
+    "models/__init__.py",
+    "models/message.py",
+    "actors/__init__.py",
+    "actors/base.py",
+    "actors/sentiment_analyzer.py",
+    "storage/__init__.py",
+    "storage/redis_client.py",
+    "mock_services/__init__.py",
+    "mock_services/customer_api.py",
+    "tests/__init__.py",
+    "tests/conftest.py",
+    "tests/unit",
+    "tests/integration",
+)
+
+# Written after a successful run so unchanged environments can skip validation
+_STAMP_FILE = project_root / ".cache" / "validate.stamp"
+
+# Dependency declarations whose changes invalidate the stamp
+_STAMP_CONFIG_GLOBS = ("pyproject.toml", "pytest.ini", "requirements*.txt")
+
+# Skip the remaining checks once a prerequisite fails (VALIDATE_FAIL_FAST=0 runs everything)
+FAIL_FAST = os.environ.get("VALIDATE_FAIL_FAST", "1") == "1"
+
+# Fewest required paths under one directory for which listing it beats stat()-ing each
+_MIN_PATHS_PER_LISTING = 2
+
+# Project modules imported by test_basic_imports, reused by test_basic_functionality
+_loaded_modules: Dict[str, ModuleType] = {}
+
+# SentimentAnalyzer reused across validation runs in a long-lived process
+_analyzer: Optional[Any] = None
+
+# Summary label for each check outcome; None marks a check skipped by FAIL_FAST
+_STATUS = {None: "⏭️ SKIPPED", False: "❌ FAILED", True: "✅ PASSED", "cached": "✅ CACHED"}
+
+# Checks whose outcome depends only on the stamp inputs, skipped while the stamp is valid.
+# Project imports and functionality always run: source edits don't change the stamp.
+_STAMPED_CHECKS = frozenset({"Project Structure", "Pytest Configuration"})
+
+# Output buffer of the check currently running; None means print directly
+_check_output: ContextVar[Optional[List[str]]] = ContextVar("check_output", default=None)
+
+
+def log(message: str = "") -> None:
+    """Print a line, or buffer it while running as one of several concurrent checks."""
+    buffer = _check_output.get()
+    if buffer is None:
+        print(message)
+    else:
+        buffer.append(message)
+
+
+@functools.lru_cache(maxsize=None)
+def _has_module(name: str) -> bool:
+    """Return whether a module can be found, without executing it.
+
+    Top-level names are looked up with PathFinder directly, skipping the other
+    meta path finders; anything it cannot resolve (dotted names, namespace or
+    editable installs) goes through the full importlib.util.find_spec.
+    """
+    if name in sys.modules:
+        return True
+    if "." not in name and importlib.machinery.PathFinder.find_spec(name) is not None:
+        return True
+    try:
+        return importlib.util.find_spec(name) is not None
+    except ImportError:
+        return False
+
 
-# Add project root to Python path
-project_root = Path(__file__).parent
-sys.path.insert(0, str(project_root))
+def _import_project_module(name: str) -> ModuleType:
+    """Import a project module once and keep it for the checks that use it."""
+    # Modules already imported elsewhere (e.g. during pytest collection) skip the import machinery
+    module = _loaded_modules.get(name) or sys.modules.get(name)
+    if module is None:
+        # The project root only needs to be importable once project modules are loaded
+        if str(project_root) not in sys.path:
+            sys.path.insert(0, str(project_root))
+        module = importlib.import_module(name)
+    _loaded_modules[name] = module
+    return module
+
+
+def _try_import_all(names: List[str]) -> Dict[str, Optional[Exception]]:
+    """Import project modules in order, mapping each to its import error (or None)."""
+    errors: Dict[str, Optional[Exception]] = {}
+    for name in names:
+        try:
+            _import_project_module(name)
+            errors[name] = None
+        except (ImportError, SyntaxError) as e:
+            errors[name] = e
+    return errors
 
 
 def check_python_version():
     """Check Python version compatibility."""
-    print("🐍 Checking Python version...")
-    version = sys.version_info
+    log("🐍 Checking Python version...")
 
-    if version.major < 3 or (version.major == 3 and version.minor < 8):
-        print(f"❌ Python {version.major}.{version.minor} is not supported. Please use Python 3.8+")
+    if sys.version_info < (3, 8):
+        log(_PY_VERSION_BAD_MSG)
         return False
 
-    print(f"✅ Python {version.major}.{version.minor}.{version.micro} is compatible")
+    log(_PY_VERSION_OK_MSG)
     return True
 
 
 def check_required_packages():
     """Check that required packages are available."""
-    print("\n📦 Checking required packages...")
-
-    required_packages = [
-        ("pytest", "pytest"),
-        ("pytest_asyncio", "pytest-asyncio"),
-        ("pydantic", "pydantic"),
-        ("asyncio", "built-in asyncio"),
-        ("json", "built-in json"),
-        ("unittest.mock", "built-in unittest.mock"),
-    ]
+    log("\n📦 Checking required packages...")
 
     missing_packages = []
+    log("✅ built-in asyncio/json/unittest.mock (guaranteed on Python 3.8+)")
 
-    for package, display_name in required_packages:
-        try:
-            __import__(package)
-            print(f"✅ {display_name}")
-        except ImportError:
-            print(f"❌ {display_name} - not found")
+    for package, display_name in _REQUIRED_PACKAGES:
+        if _has_module(package):
+            log(f"✅ {display_name}")
+        else:
+            log(f"❌ {display_name} - not found")
             missing_packages.append(display_name)
 
     if missing_packages:
-        print(f"\n❌ Missing packages: {', '.join(missing_packages)}")
-        print("Install missing packages with: pip install pytest pytest-asyncio")
+        log(f"\n❌ Missing packages: {', '.join(missing_packages)}")
+        log("Install missing packages with: pip install pytest pytest-asyncio")
         return False
 
     return True
@@ -61,44 +170,49 @@ def check_required_packages():
 
 def check_project_structure():
     """Check that the project structure is correct."""
-    print("\n📁 Checking project structure...")
-
-    required_paths = [
-        "models/__init__.py",
-        "models/message.py",
-        "actors/__init__.py",
-        "actors/base.py",
-        "actors/sentiment_analyzer.py",
-        "storage/__init__.py",
-        "storage/redis_client.py",
-        "mock_services/__init__.py",
-        "mock_services/customer_api.py",
-        "tests/__init__.py",
-        "tests/conftest.py",
-        "tests/unit",
-        "tests/integration",
-    ]
+    log("\n📁 Checking project structure...")
 
     missing_paths = []
-
-    for path in required_paths:
-        full_path = project_root / path
-        if full_path.exists():
-            print(f"✅ {path}")
+    root_str = str(project_root)
+
+    # One directory listing per parent instead of a stat() per required path.
+    # A parent holding a single required path is cheaper to check with one stat().
+    paths_per_parent = Counter(os.path.dirname(path) for path in _REQUIRED_PATHS)
+    entries_by_parent = {}
+    for parent, count in paths_per_parent.items():
+        if count < _MIN_PATHS_PER_LISTING:
+            entries_by_parent[parent] = None
+            continue
+        try:
+            with os.scandir(os.path.join(root_str, parent)) as it:
+                entries_by_parent[parent] = {entry.name for entry in it}
+        except OSError:
+            entries_by_parent[parent] = None
+
+    for path in _REQUIRED_PATHS:
+        parent, name = os.path.split(path)
+        entries = entries_by_parent[parent]
+        present = os.path.exists(os.path.join(root_str, path)) if entries is None else name in entries
+        if present:
+            log(f"✅ {path}")
         else:
-            print(f"❌ {path} - not found")
+            log(f"❌ {path} - not found")
             missing_paths.append(path)
 
     if missing_paths:
-        print(f"\n❌ Missing paths: {missing_paths}")
+        log(f"\n❌ Missing paths: {missing_paths}")
         return False
 
     return True
 
 
-def test_basic_imports():
-    """Test that basic project modules can be imported."""
-    print("\n🔧 Testing basic imports...")
+async def test_basic_imports():
+    """Test that basic project modules can be imported.
+
+    A coroutine so that it runs on the event loop thread: litellm's import is not
+    safe to run on a worker thread.
+    """
+    log("\n🔧 Testing basic imports...")
 
     test_imports = [
         ("models.message", "Message models"),
@@ -110,28 +224,43 @@ def test_basic_imports():
 
     failed_imports = []
 
+    # Imported one after another: the project packages share dependencies (storage,
+    # litellm) whose circular imports fail when initialized concurrently
+    errors = _try_import_all([module for module, _ in test_imports])
+
     for module, description in test_imports:
-        try:
-            __import__(module)
-            print(f"✅ {description}")
-        except ImportError as e:
-            print(f"❌ {description} - {e}")
+        error = errors[module]
+        if error is None:
+            log(f"✅ {description}")
+        else:
+            log(f"❌ {description} - {error}")
             failed_imports.append(description)
 
     if failed_imports:
-        print(f"\n❌ Failed imports: {failed_imports}")
+        log(f"\n❌ Failed imports: {failed_imports}")
         return False
 
     return True
 
 
+async def _get_analyzer() -> Any:
+    """Return the SentimentAnalyzer shared by every validation run in this process."""
+    global _analyzer
+    if _analyzer is None:
+        _analyzer = _import_project_module("actors.sentiment_analyzer").SentimentAnalyzer()
+    return _analyzer
+
+
 async def test_basic_functionality():
     """Test basic functionality of core components."""
-    print("\n⚙️ Testing basic functionality...")
+    log("\n⚙️ Testing basic functionality...")
 
     try:
         # Test message creation
-        from models.message import MessagePayload, StandardRoutes, create_support_message
+        message_models = _import_project_module("models.message")
+        MessagePayload = message_models.MessagePayload
+        StandardRoutes = message_models.StandardRoutes
+        create_support_message = message_models.create_support_message
 
         payload = MessagePayload(customer_message="Test message", customer_email="test@example.com")
 
@@ -140,111 +269,239 @@ async def test_basic_functionality():
             customer_message="Test message", customer_email="test@example.com", session_id="test-session", route=route
         )
 
-        print("✅ Message creation works")
+        log("✅ Message creation works")
 
         # Test sentiment analyzer
-        from actors.sentiment_analyzer import SentimentAnalyzer
-
-        analyzer = SentimentAnalyzer()
+        analyzer = await _get_analyzer()
         result = await analyzer.process(payload)
 
         assert result is not None
         assert "sentiment" in result
         assert "urgency" in result
-        print("✅ Sentiment analyzer works")
+        log("✅ Sentiment analyzer works")
 
         # Test route navigation
         assert route.get_current_actor() == "sentiment_analyzer"
         assert route.advance() is True
         assert route.get_current_actor() == "intent_analyzer"
-        print("✅ Route navigation works")
+        log("✅ Route navigation works")
 
         return True
 
     except Exception as e:
-        print(f"❌ Functionality test failed: {e}")
+        log(f"❌ Functionality test failed: {e}")
         return False
 
 
 def test_pytest_configuration():
     """Test that pytest is properly configured."""
-    print("\n🧪 Testing pytest configuration...")
+    log("\n🧪 Testing pytest configuration...")
 
     try:
-        # Check if pytest.ini exists
-        pytest_ini = project_root / "pytest.ini"
-        if pytest_ini.exists():
-            print("✅ pytest.ini configuration found")
+        # Ask pytest which config file it would use: pytest.ini, pyproject.toml, tox.ini or setup.cfg
+        from _pytest.config.findpaths import locate_config
+
+        try:
+            inipath = locate_config(project_root, [project_root])[1]
+        except TypeError:  # pytest < 8 has no invocation_dir parameter
+            inipath = locate_config([project_root])[1]
+
+        if inipath is not None:
+            log(f"✅ pytest configuration found in {inipath.name}")
         else:
-            print("❌ pytest.ini not found")
+            log("❌ No pytest configuration found")
             return False
 
         # Check if conftest.py exists
-        conftest = project_root / "tests" / "conftest.py"
-        if conftest.exists():
-            print("✅ conftest.py found")
+        conftest = os.path.join(str(project_root), "tests", "conftest.py")
+        if os.path.exists(conftest):
+            log("✅ conftest.py found")
         else:
-            print("❌ conftest.py not found")
+            log("❌ conftest.py not found")
             return False
 
         return True
 
     except Exception as e:
-        print(f"❌ Pytest configuration test failed: {e}")
+        log(f"❌ Pytest configuration test failed: {e}")
         return False
 
 
-async def run_validation():
-    """Run all validation checks."""
-    print("=" * 60)
-    print("ACTOR MESH E-COMMERCE SUPPORT AGENT")
-    print("Test Setup Validation")
-    print("=" * 60)
-
-    checks = [
-        ("Python Version", check_python_version()),
-        ("Required Packages", check_required_packages()),
-        ("Project Structure", check_project_structure()),
-        ("Basic Imports", test_basic_imports()),
-        ("Basic Functionality", await test_basic_functionality()),
-        ("Pytest Configuration", test_pytest_configuration()),
+async def run_check(check: Callable[[], Any]) -> Tuple[bool, List[str]]:
+    """Run a single check with its output buffered.
+
+    Synchronous checks run on the default executor so that filesystem and
+    import work overlaps with the other checks.
+    """
+    import asyncio
+
+    lines: List[str] = []
+    _check_output.set(lines)
+
+    if asyncio.iscoroutinefunction(check):
+        result = await check()
+    else:
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(None, contextvars.copy_context().run, check)
+
+    return result, lines
+
+
+def _installed_distributions() -> str:
+    """Digest of the installed distributions, taken from the dist-info names on sys.path."""
+    # dist-info/egg-info directory names carry the distribution name and version,
+    # so listing the site directories is enough to notice installs and upgrades
+    names: List[str] = []
+    for entry in sys.path:
+        try:
+            with os.scandir(entry or ".") as it:
+                names.extend(e.name for e in it if e.name.endswith((".dist-info", ".egg-info")))
+        except OSError:
+            continue
+    return hashlib.sha256("\n".join(sorted(names)).encode()).hexdigest()
+
+
+def _stamp_inputs() -> Dict[str, Any]:
+    """Collect the inputs a successful validation result depends on."""
+    inputs: Dict[str, Any] = {"python": sys.version, "distributions": _installed_distributions()}
+    try:
+        inputs["root_mtime"] = os.stat(project_root).st_mtime
+    except OSError:
+        inputs["root_mtime"] = None
+    config_mtimes: Dict[str, float] = {}
+    for pattern in _STAMP_CONFIG_GLOBS:
+        for path in project_root.glob(pattern):
+            try:
+                config_mtimes[path.name] = path.stat().st_mtime
+            except OSError:
+                pass
+    inputs["config_mtimes"] = config_mtimes
+    return inputs
+
+
+def _validation_cached() -> bool:
+    """Return whether the last validation passed with the same inputs."""
+    try:
+        with open(_STAMP_FILE) as f:
+            stamp = json.load(f)
+    except (OSError, ValueError):
+        return False
+    return stamp.get("passed") is True and stamp.get("inputs") == _stamp_inputs()
+
+
+def _write_stamp() -> None:
+    """Record a successful validation for later invocations."""
+    try:
+        _STAMP_FILE.parent.mkdir(parents=True, exist_ok=True)
+        with open(_STAMP_FILE, "w") as f:
+            json.dump({"inputs": _stamp_inputs(), "passed": True}, f)
+    except OSError:
+        pass
+
+
+async def _run_checks(force: bool) -> bool:
+    """Run all validation checks and report on them through log()."""
+    import asyncio
+
+    log("=" * 60)
+    log("ACTOR MESH E-COMMERCE SUPPORT AGENT")
+    log("Test Setup Validation")
+    log("=" * 60)
+
+    cached = not force and _validation_cached()
+    if cached:
+        log("✅ Structure and pytest configuration unchanged since the last successful run (use --force to re-check)")
+
+    # Cheap, independent prerequisites run first and concurrently. The project-module
+    # checks only run once they pass, one at a time: Basic Functionality uses the modules
+    # Basic Imports loads, and importing the same packages from two threads at once fails
+    # on partially initialized modules.
+    stages = [
+        [
+            ("Python Version", check_python_version),
+            ("Required Packages", check_required_packages),
+            ("Project Structure", check_project_structure),
+            ("Pytest Configuration", test_pytest_configuration),
+        ],
+        [("Basic Imports", test_basic_imports)],
+        [("Basic Functionality", test_basic_functionality)],
     ]
 
+    checks = []
     all_passed = True
 
-    for check_name, result in checks:
-        if not result:
-            all_passed = False
+    for validations in stages:
+        if not all_passed and FAIL_FAST:
+            checks.extend((check_name, None) for check_name, _ in validations)
+            continue
+
+        if cached:
+            checks.extend((check_name, "cached") for check_name, _ in validations if check_name in _STAMPED_CHECKS)
+            validations = [
+                (check_name, check) for check_name, check in validations if check_name not in _STAMPED_CHECKS
+            ]
+
+        # Checks within a stage are independent; each one's output is printed as a block
+        outcomes = await asyncio.gather(*(run_check(check) for _, check in validations))
+
+        for (check_name, _), (result, lines) in zip(validations, outcomes):
+            for line in lines:
+                log(line)
+            checks.append((check_name, bool(result)))
+            if not result:
+                all_passed = False
 
-    print("\n" + "=" * 60)
-    print("VALIDATION SUMMARY")
-    print("=" * 60)
+    log("\n" + "=" * 60)
+    log("VALIDATION SUMMARY")
+    log("=" * 60)
 
     for check_name, result in checks:
-        status = "✅ PASSED" if result else "❌ FAILED"
-        print(f"{check_name:.<40} {status}")
+        log(f"{check_name:.<40} {_STATUS[result]}")
 
     if all_passed:
-        print("\n🎉 All validation checks passed! The test environment is ready.")
-        print("\nNext steps:")
-        print("  • Run unit tests: make test-unit")
-        print("  • Run all tests: make test")
-        print("  • Run with coverage: make test-coverage")
-        print("  • Run test runner: python tests/test_runner.py")
+        _write_stamp()
+        log("\n🎉 All validation checks passed! The test environment is ready.")
+        log("\nNext steps:")
+        log("  • Run unit tests: make test-unit")
+        log("  • Run all tests: make test")
+        log("  • Run with coverage: make test-coverage")
+        log("  • Run test runner: python tests/test_runner.py")
         return True
     else:
-        print("\n❌ Some validation checks failed. Please fix the issues above.")
-        print("\nCommon solutions:")
-        print("  • Install dependencies: pip install -r requirements.txt")
-        print("  • Check Python version: python --version")
-        print("  • Verify project structure is complete")
+        log("\n❌ Some validation checks failed. Please fix the issues above.")
+        log("\nCommon solutions:")
+        log("  • Install dependencies: pip install -r requirements.txt")
+        log("  • Check Python version: python --version")
+        log("  • Verify project structure is complete")
         return False
 
 
+async def run_validation(force: bool = False):
+    """Run all validation checks.
+
+    The report is collected in memory and written to stdout in one call.
+    """
+    output: List[str] = []
+    _check_output.set(output)
+    try:
+        return await _run_checks(force)
+    finally:
+        _check_output.set(None)
+        sys.stdout.write("\n".join(output) + "\n")
+        sys.stdout.flush()
+
+
 def main():
     """Main entry point."""
+    parser = argparse.ArgumentParser(description="Validate the test environment setup")
+    parser.add_argument("--force", action="store_true", help="Ignore the cached result of a previous successful run")
+    args = parser.parse_args()
+
+    # asyncio is only needed to drive the checks, so it is not imported at module load
+    import asyncio
+
     try:
-        success = asyncio.run(run_validation())
+        success = asyncio.run(run_validation(force=args.force))
         sys.exit(0 if success else 1)
     except KeyboardInterrupt:
         print("\n\n❌ Validation interrupted by user")
@@ -7,11 +7,13 @@ and utility functions for actor management.
 
 import asyncio
 import json
+from collections import deque
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from actors.base import (
     BaseActor,
+    BatchingProcessorActor,
     ProcessorActor,
     RouterActor,
     run_actors_forever,
@@ -20,13 +22,26 @@ from actors.base import (
 )
 from models.message import Message, MessagePayload
 
+# Calls remembered by the mock actors; keeps memory flat in high-volume tests
+MAX_RECORDED_CALLS = 1024
+
+
+class AckSpy:
+    """Awaitable stand-in for a NATS message's ack()/nak() that only counts calls."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def __call__(self, *args, **kwargs):
+        self.calls += 1
+
 
 class MockProcessorActor(ProcessorActor):
     """Test implementation of ProcessorActor."""
 
     def __init__(self, name: str = "test_processor", nats_url: str = "nats://localhost:4222"):
         super().__init__(name, nats_url)
-        self.process_calls = []
+        self.process_calls = deque(maxlen=MAX_RECORDED_CALLS)
         self.process_result = {"test": "result"}
         self.process_exception = None
 
@@ -42,12 +57,25 @@ class MockProcessorActor(ProcessorActor):
         payload.sentiment = result
 
 
+class MockBatchingActor(BatchingProcessorActor):
+    """Test implementation of BatchingProcessorActor."""
+
+    def __init__(self, name: str = "test_batcher", nats_url: str = "nats://localhost:4222", max_batch_size: int = 3):
+        super().__init__(name, nats_url, max_batch_size=max_batch_size, max_queue_time=0.01)
+        self.batch_calls = deque(maxlen=MAX_RECORDED_CALLS)
+
+    async def process_batch(self, payloads):
+        """Mock batch method that records each batch."""
+        self.batch_calls.append(list(payloads))
+        return [{"batch_size": len(payloads)} for _ in payloads]
+
+
 class MockRouterActor(RouterActor):
     """Test implementation of RouterActor."""
 
     def __init__(self, name: str = "test_router", nats_url: str = "nats://localhost:4222"):
         super().__init__(name, nats_url)
-        self.route_calls = []
+        self.route_calls = deque(maxlen=MAX_RECORDED_CALLS)
         self.route_exception = None
 
     async def process(self, payload: MessagePayload):
@@ -187,8 +215,8 @@ class TestBaseActor:
         # Create mock NATS message
         mock_msg = MagicMock()
         mock_msg.data = json.dumps(sample_message.model_dump()).encode()
-        mock_msg.ack = AsyncMock()
-        mock_msg.nak = AsyncMock()
+        mock_msg.ack = AckSpy()
+        mock_msg.nak = AckSpy()
 
         await actor.start()
         await actor._process_message(mock_msg)
@@ -199,8 +227,8 @@ class TestBaseActor:
         processed_payload = actor.process_calls[0]
         assert processed_payload.customer_message == sample_message.payload.customer_message
         assert processed_payload.customer_email == sample_message.payload.customer_email
-        mock_msg.ack.assert_called_once()
-        mock_msg.nak.assert_not_called()
+        assert mock_msg.ack.calls == 1
+        assert mock_msg.nak.calls == 0
 
     @pytest.mark.asyncio
     async def test_process_message_wrong_actor(self, mock_nats_setup, sample_message):
@@ -214,16 +242,36 @@ class TestBaseActor:
 
         mock_msg = MagicMock()
         mock_msg.data = json.dumps(sample_message.model_dump()).encode()
-        mock_msg.ack = AsyncMock()
-        mock_msg.nak = AsyncMock()
+        mock_msg.ack = AckSpy()
+        mock_msg.nak = AckSpy()
 
         await actor.start()
         await actor._process_message(mock_msg)
 
         # Should NAK the message
         assert len(actor.process_calls) == 0
-        mock_msg.nak.assert_called_once()
-        mock_msg.ack.assert_not_called()
+        assert mock_msg.nak.calls == 1
+        assert mock_msg.ack.calls == 0
+
+    @pytest.mark.asyncio
+    async def test_process_message_wrong_actor_skips_parsing(self, mock_nats_setup, sample_message):
+        """Test that a message not mentioning the actor is rejected without parsing."""
+        mock_connect, mock_nc, mock_js = mock_nats_setup
+        actor = MockProcessorActor(name="wrong_actor")
+
+        sample_message.route.steps = ["correct_actor"]
+        sample_message.route.current_step = 0
+
+        mock_msg = MagicMock()
+        mock_msg.data = json.dumps(sample_message.model_dump()).encode()
+        mock_msg.nak = AckSpy()
+
+        await actor.start()
+        with patch.object(Message, "model_validate_json") as mock_validate:
+            await actor._process_message(mock_msg)
+
+        mock_validate.assert_not_called()
+        assert mock_msg.nak.calls == 1
 
     @pytest.mark.asyncio
     async def test_process_message_timeout(self, mock_nats_setup, sample_message):
@@ -244,15 +292,15 @@ class TestBaseActor:
 
         mock_msg = MagicMock()
         mock_msg.data = json.dumps(sample_message.model_dump()).encode()
-        mock_msg.ack = AsyncMock()
-        mock_msg.nak = AsyncMock()
+        mock_msg.ack = AckSpy()
+        mock_msg.nak = AckSpy()
 
         await actor.start()
         await actor._process_message(mock_msg)
 
         # Should handle timeout error
-        mock_msg.nak.assert_called_once()
-        mock_msg.ack.assert_not_called()
+        assert mock_msg.nak.calls == 1
+        assert mock_msg.ack.calls == 0
 
     @pytest.mark.asyncio
     async def test_process_message_exception(self, mock_nats_setup, sample_message):
@@ -266,15 +314,15 @@ class TestBaseActor:
 
         mock_msg = MagicMock()
         mock_msg.data = json.dumps(sample_message.model_dump()).encode()
-        mock_msg.ack = AsyncMock()
-        mock_msg.nak = AsyncMock()
+        mock_msg.ack = AckSpy()
+        mock_msg.nak = AckSpy()
 
         await actor.start()
         await actor._process_message(mock_msg)
 
         # Should handle processing error
-        mock_msg.nak.assert_called_once()
-        mock_msg.ack.assert_not_called()
+        assert mock_msg.nak.calls == 1
+        assert mock_msg.ack.calls == 0
 
     @pytest.mark.asyncio
     async def test_message_routing_advance(self, mock_nats_setup, sample_message):
@@ -288,7 +336,7 @@ class TestBaseActor:
 
         mock_msg = MagicMock()
         mock_msg.data = json.dumps(sample_message.model_dump()).encode()
-        mock_msg.ack = AsyncMock()
+        mock_msg.ack = AckSpy()
 
         await actor.start()
         await actor._process_message(mock_msg)
@@ -311,7 +359,7 @@ class TestBaseActor:
 
         mock_msg = MagicMock()
         mock_msg.data = json.dumps(sample_message.model_dump()).encode()
-        mock_msg.ack = AsyncMock()
+        mock_msg.ack = AckSpy()
 
         await actor.start()
         await actor._process_message(mock_msg)
@@ -334,15 +382,15 @@ class TestBaseActor:
 
         mock_msg = MagicMock()
         mock_msg.data = json.dumps(sample_message.model_dump()).encode()
-        mock_msg.ack = AsyncMock()
-        mock_msg.nak = AsyncMock()
+        mock_msg.ack = AckSpy()
+        mock_msg.nak = AckSpy()
 
         await actor.start()
         await actor._process_message(mock_msg)
 
         # Should NAK for retry (not at max retries yet)
-        mock_msg.nak.assert_called_once()
-        mock_msg.ack.assert_not_called()
+        assert mock_msg.nak.calls == 1
+        assert mock_msg.ack.calls == 0
 
     @pytest.mark.asyncio
     async def test_error_handling_max_retries(self, mock_nats_setup, sample_message):
@@ -359,8 +407,8 @@ class TestBaseActor:
 
         mock_msg = MagicMock()
         mock_msg.data = json.dumps(sample_message.model_dump()).encode()
-        mock_msg.ack = AsyncMock()
-        mock_msg.nak = AsyncMock()
+        mock_msg.ack = AckSpy()
+        mock_msg.nak = AckSpy()
 
         await actor.start()
         await actor._process_message(mock_msg)
@@ -369,7 +417,7 @@ class TestBaseActor:
         mock_js.publish.assert_called_once()
         call_args = mock_js.publish.call_args[0]
         assert call_args[0] == "ecommerce.support.error_handler"
-        mock_msg.ack.assert_called_once()
+        assert mock_msg.ack.calls == 1
 
     @pytest.mark.asyncio
     async def test_send_message(self, mock_nats_setup, sample_message):
@@ -380,7 +428,7 @@ class TestBaseActor:
         await actor.start()
         await actor.send_message("test.subject", sample_message)
 
-        mock_js.publish.assert_called_once_with("test.subject", json.dumps(sample_message.model_dump()).encode())
+        mock_js.publish.assert_called_once_with("test.subject", sample_message.model_dump_json().encode())
 
     @pytest.mark.asyncio
     async def test_send_message_not_started(self, sample_message):
@@ -417,6 +465,79 @@ class TestProcessorActor:
         assert actor.nats_url == "nats://test:4222"
 
 
+class TestBatchingProcessorActor:
+    """Test cases for BatchingProcessorActor class."""
+
+    def test_batching_actor_inheritance(self):
+        """Test BatchingProcessorActor inherits from ProcessorActor."""
+        actor = MockBatchingActor()
+        assert isinstance(actor, ProcessorActor)
+        assert actor.max_batch_size == 3
+        assert actor.max_queue_time == 0.01
+
+    def test_in_flight_limit_fits_full_batch(self):
+        """Test that the in-flight limit is raised so a full batch can be collected."""
+        actor = MockBatchingActor(max_batch_size=32)
+        assert actor.max_in_flight == 32
+
+        small = MockBatchingActor()
+        assert small.max_in_flight >= small.max_batch_size
+
+    @pytest.mark.asyncio
+    async def test_batch_processor(self, mock_nats_setup, sample_message):
+        """Test that concurrently arriving messages are processed as one batch."""
+        mock_connect, mock_nc, mock_js = mock_nats_setup
+        actor = MockBatchingActor()
+
+        sample_message.route.steps = ["test_batcher"]
+        sample_message.route.current_step = 0
+
+        mock_msgs = []
+        for _ in range(3):
+            mock_msg = MagicMock()
+            mock_msg.data = json.dumps(sample_message.model_dump()).encode()
+            mock_msg.ack = AckSpy()
+            mock_msg.nak = AckSpy()
+            mock_msgs.append(mock_msg)
+
+        await actor.start()
+        await asyncio.gather(*(actor._process_message(mock_msg) for mock_msg in mock_msgs))
+
+        assert len(actor.batch_calls) == 1
+        assert len(actor.batch_calls[0]) == 3
+        for mock_msg in mock_msgs:
+            assert mock_msg.ack.calls == 1
+            assert mock_msg.nak.calls == 0
+
+    @pytest.mark.asyncio
+    async def test_partial_batch_flushed_after_queue_time(self, sample_message):
+        """Test that a batch smaller than max_batch_size is processed after max_queue_time."""
+        actor = MockBatchingActor()
+
+        result = await asyncio.wait_for(actor.process(sample_message.payload), timeout=1.0)
+
+        assert result == {"batch_size": 1}
+        assert len(actor.batch_calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_stop_drops_pending_batch(self, sample_message):
+        """Test that stopping the actor fails queued payloads instead of processing them later."""
+        actor = MockBatchingActor()
+        actor.max_queue_time = 10.0
+
+        waiter = asyncio.create_task(actor.process(sample_message.payload))
+        await asyncio.sleep(0)
+        assert len(actor._batch) == 1
+
+        await actor.stop()
+
+        with pytest.raises(RuntimeError, match="Actor stopped"):
+            await waiter
+        assert actor._batch == []
+        assert actor._batch_handle is None
+        assert len(actor.batch_calls) == 0
+
+
 class TestRouterActor:
     """Test cases for RouterActor class."""
 
@@ -437,7 +558,7 @@ class TestRouterActor:
 
         mock_msg = MagicMock()
         mock_msg.data = json.dumps(sample_message.model_dump()).encode()
-        mock_msg.ack = AsyncMock()
+        mock_msg.ack = AckSpy()
 
         await router.start()
         await router._process_message(mock_msg)
@@ -458,14 +579,14 @@ class TestRouterActor:
 
         mock_msg = MagicMock()
         mock_msg.data = json.dumps(sample_message.model_dump()).encode()
-        mock_msg.ack = AsyncMock()
-        mock_msg.nak = AsyncMock()
+        mock_msg.ack = AckSpy()
+        mock_msg.nak = AckSpy()
 
         await router.start()
         await router._process_message(mock_msg)
 
         # Should handle routing error
-        mock_msg.nak.assert_called_once()
+        assert mock_msg.nak.calls == 1
 
 
 class TestActorUtilities:
@@ -555,7 +676,7 @@ class TestActorTaskManagement:
 
         mock_msg = MagicMock()
         mock_msg.data = json.dumps(sample_message.model_dump()).encode()
-        mock_msg.ack = AsyncMock()
+        mock_msg.ack = AckSpy()
 
         await actor.start()
 
@@ -568,6 +689,40 @@ class TestActorTaskManagement:
         # Task should be cleaned up
         assert len(actor._tasks) == initial_task_count
 
+    @pytest.mark.asyncio
+    async def test_in_flight_messages_are_bounded(self, mock_nats_setup, sample_message):
+        """Test that the wrapper waits for a free slot once max_in_flight is reached."""
+        mock_connect, mock_nc, mock_js = mock_nats_setup
+        actor = MockProcessorActor()
+        actor.max_in_flight = 1
+
+        release = asyncio.Event()
+
+        async def blocking_process(payload):
+            await release.wait()
+            return None
+
+        actor.process = blocking_process
+
+        sample_message.route.steps = ["test_processor"]
+        sample_message.route.current_step = 0
+
+        mock_msg = MagicMock()
+        mock_msg.data = json.dumps(sample_message.model_dump()).encode()
+        mock_msg.ack = AckSpy()
+
+        await actor.start()
+        await actor._handle_message_wrapper(mock_msg)
+
+        second = asyncio.create_task(actor._handle_message_wrapper(mock_msg))
+        await asyncio.sleep(0.01)
+        assert not second.done()
+        assert len(actor._tasks) == 1
+
+        release.set()
+        await asyncio.wait_for(second, timeout=1.0)
+        await actor.stop()
+
     @pytest.mark.asyncio
     async def test_task_cancellation_on_stop(self, mock_nats_setup):
         """Test that tasks are cancelled when actor stops."""
@@ -594,21 +749,45 @@ class TestActorErrorScenarios:
     """Test cases for various error scenarios."""
 
     @pytest.mark.asyncio
-    async def test_malformed_message_data(self, mock_nats_setup):
-        """Test handling of malformed message data."""
+    async def test_message_not_naming_actor_rejected_unparsed(self, mock_nats_setup):
+        """Test that data without the actor's quoted name is NAKed before parsing."""
         mock_connect, mock_nc, mock_js = mock_nats_setup
         actor = MockProcessorActor()
 
         mock_msg = MagicMock()
         mock_msg.data = b"invalid json data"
-        mock_msg.ack = AsyncMock()
-        mock_msg.nak = AsyncMock()
+        mock_msg.ack = AckSpy()
+        mock_msg.nak = AckSpy()
 
         await actor.start()
-        await actor._process_message(mock_msg)
+        with patch.object(actor, "_handle_error", wraps=actor._handle_error) as handle_error:
+            await actor._process_message(mock_msg)
 
-        # Should NAK malformed message
-        mock_msg.nak.assert_called_once()
+        # Should NAK malformed message without going through error handling
+        assert mock_msg.nak.calls == 1
+        handle_error.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_malformed_message_data(self, mock_nats_setup):
+        """Test handling of malformed message data that names the actor."""
+        mock_connect, mock_nc, mock_js = mock_nats_setup
+        actor = MockProcessorActor()
+
+        # Passes the name check but fails to parse
+        mock_msg = MagicMock()
+        mock_msg.data = b'{"route": {"steps": ["test_processor"]'
+        mock_msg.ack = AckSpy()
+        mock_msg.nak = AckSpy()
+
+        await actor.start()
+        with patch.object(actor, "_handle_error", wraps=actor._handle_error) as handle_error:
+            await actor._process_message(mock_msg)
+
+        # Should NAK malformed message through the error handler
+        handle_error.assert_awaited_once()
+        assert handle_error.call_args.args[1:3] == (None, "processing_error")
+        assert mock_msg.nak.calls == 1
+        assert len(actor.process_calls) == 0
 
     @pytest.mark.asyncio
     async def test_stream_creation_failure(self, mock_nats_setup):
@@ -649,8 +828,8 @@ class TestActorErrorScenarios:
 
         mock_msg = MagicMock()
         mock_msg.data = json.dumps(sample_message.model_dump()).encode()
-        mock_msg.ack = AsyncMock()
-        mock_msg.nak = AsyncMock()
+        mock_msg.ack = AckSpy()
+        mock_msg.nak = AckSpy()
 
         await actor.start()
         await actor._process_message(mock_msg)
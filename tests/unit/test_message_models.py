@@ -5,9 +5,13 @@ Tests the core message protocol models including MessagePayload, Route, Message,
 StandardRoutes, and factory functions.
 """
 
+import types
 from datetime import datetime, timezone
 
+import pytest
+from pydantic import TypeAdapter
 from models.message import (
+    MAX_RECOVERY_LOG,
     Message,
     MessagePayload,
     Route,
@@ -16,6 +20,74 @@ from models.message import (
     create_support_message,
 )
 
+# Built once; constructing an adapter compiles a validator
+_PAYLOAD_ADAPTER = TypeAdapter(MessagePayload)
+
+
+def _mk_payload(customer_message="Test message", customer_email="test@example.com", **fields):
+    """Build a MessagePayload from trusted literals without running validation."""
+    return MessagePayload.model_construct(customer_message=customer_message, customer_email=customer_email, **fields)
+
+
+# Enrichments from several actors, applied by test_complex_enrichment_scenario
+_COMPLEX_ENRICHMENTS = types.MappingProxyType(
+    {
+        "sentiment": {
+            "sentiment": {"label": "negative", "score": -0.9, "confidence": 0.95},
+            "urgency": {"level": "high", "score": 0.9},
+            "is_complaint": True,
+        },
+        "intent": {
+            "intent": {"category": "order_inquiry", "subcategory": "missing_order"},
+            "confidence": 0.88,
+            "entities": [
+                {"type": "order_id", "value": "ORD-12345"},
+                {"type": "urgency", "value": "urgent"},
+                {"type": "product", "value": "laptop"},
+            ],
+        },
+        "context": {
+            "customer_context": {"profile": {"tier": "business", "email": "business@example.com"}},
+            "order_context": {"order_id": "ORD-12345", "status": "shipped"},
+        },
+        "response": "I understand this is urgent and I sincerely apologize...",
+        "guardrail_check": {"validation_status": "approved", "approved": True, "issues": []},
+    }
+)
+
+# Enrichment (field, value) each actor adds in test_message_flow_simulation
+_SIM_ENRICHMENTS = types.MappingProxyType(
+    {
+        "sentiment_analyzer": ("sentiment", {"label": "negative", "score": -0.8}),
+        "intent_analyzer": ("intent", {"category": "complaint", "confidence": 0.9}),
+        "response_generator": ("response", "I apologize for the delay..."),
+    }
+)
+
+
+@pytest.fixture(scope="session")
+def base_payload_proto():
+    """Payload prototype shared by the whole session; copy before mutating."""
+    return _mk_payload()
+
+
+@pytest.fixture
+def base_payload(base_payload_proto):
+    """Fresh copy of the payload prototype."""
+    return base_payload_proto.model_copy(deep=True)
+
+
+@pytest.fixture(scope="session")
+def single_step_route_proto():
+    """Single-step route prototype shared by the whole session; copy before mutating."""
+    return Route.model_construct(steps=["actor1"])
+
+
+@pytest.fixture
+def single_step_route(single_step_route_proto):
+    """Fresh copy of the single-step route prototype."""
+    return single_step_route_proto.model_copy(deep=True)
+
 
 class TestMessagePayload:
     """Test cases for MessagePayload model."""
@@ -35,7 +107,7 @@ class TestMessagePayload:
 
     def test_payload_enrichment(self):
         """Test adding enrichments to payload."""
-        payload = MessagePayload(customer_message="I'm angry about my order!", customer_email="angry@example.com")
+        payload = _mk_payload(customer_message="I'm angry about my order!", customer_email="angry@example.com")
 
         # Add sentiment enrichment
         sentiment_data = {"sentiment": {"label": "negative", "score": -0.8}, "urgency": {"level": "high", "score": 0.9}}
@@ -61,16 +133,28 @@ class TestMessagePayload:
 
         # Convert to dict and back
         payload_dict = original.model_dump()
-        reconstructed = MessagePayload(**payload_dict)
+        reconstructed = _PAYLOAD_ADAPTER.validate_python(payload_dict)
 
         assert reconstructed.customer_message == original.customer_message
         assert reconstructed.customer_email == original.customer_email
         assert reconstructed.sentiment == original.sentiment
         assert reconstructed.intent == original.intent
 
+    def test_payload_json_round_trip(self):
+        """Test payload JSON serialization parsed and validated in one pass."""
+        original = MessagePayload(
+            customer_message="Test message",
+            customer_email="test@example.com",
+            sentiment={"label": "positive"},
+        )
+
+        reconstructed = _PAYLOAD_ADAPTER.validate_json(original.model_dump_json())
+
+        assert reconstructed == original
+
     def test_payload_with_error(self):
         """Test payload with error information."""
-        payload = MessagePayload(customer_message="Test message", customer_email="test@example.com")
+        payload = _mk_payload()
 
         error_info = {
             "type": "processing_error",
@@ -156,7 +240,7 @@ class TestMessage:
 
     def test_create_basic_message(self):
         """Test creating a basic message."""
-        payload = MessagePayload(customer_message="Test message", customer_email="test@example.com")
+        payload = _mk_payload()
         route = Route(steps=["actor1", "actor2"])
 
         message = Message(session_id="test-session", route=route, payload=payload)
@@ -169,21 +253,37 @@ class TestMessage:
         assert "created_at" in message.metadata
         assert message.metadata["retry_count"] == 0
 
+    def test_message_ids_are_unique(self, base_payload, single_step_route):
+        """Test that generated message ids don't repeat."""
+        ids = {
+            Message(session_id="test-session", route=single_step_route, payload=base_payload).message_id
+            for _ in range(100)
+        }
+
+        assert len(ids) == 100
+
+    def test_message_id_reference_prefixes_differ(self, base_payload, single_step_route):
+        """Test that the 8-character reference IDs shown to customers differ between messages."""
+        prefixes = {
+            Message(session_id="test-session", route=single_step_route, payload=base_payload).message_id[:8]
+            for _ in range(100)
+        }
+
+        assert len(prefixes) == 100
+
     def test_message_with_custom_id(self):
         """Test creating message with custom ID."""
         custom_id = "custom-message-id"
-        payload = MessagePayload(customer_message="Test message", customer_email="test@example.com")
+        payload = _mk_payload()
         route = Route(steps=["actor1"])
 
         message = Message(message_id=custom_id, session_id="test-session", route=route, payload=payload)
 
         assert message.message_id == custom_id
 
-    def test_message_enrichment(self):
+    def test_message_enrichment(self, base_payload, single_step_route):
         """Test message enrichment functionality."""
-        payload = MessagePayload(customer_message="Test message", customer_email="test@example.com")
-        route = Route(steps=["actor1"])
-        message = Message(session_id="test-session", route=route, payload=payload)
+        message = Message(session_id="test-session", route=single_step_route, payload=base_payload)
 
         # Test enrichment
         sentiment_data = {"label": "positive", "score": 0.8}
@@ -191,11 +291,9 @@ class TestMessage:
 
         assert message.payload.sentiment == sentiment_data
 
-    def test_message_error_handling(self):
+    def test_message_error_handling(self, base_payload, single_step_route):
         """Test message error handling functionality."""
-        payload = MessagePayload(customer_message="Test message", customer_email="test@example.com")
-        route = Route(steps=["actor1"])
-        message = Message(session_id="test-session", route=route, payload=payload)
+        message = Message(session_id="test-session", route=single_step_route, payload=base_payload)
 
         # Add error
         message.add_error("processing_error", "Test error", "test_actor")
@@ -210,11 +308,21 @@ class TestMessage:
         assert len(message.payload.recovery_log) == 1
         assert message.payload.recovery_log[0] == message.payload.error
 
-    def test_message_retry_increment(self):
+    def test_recovery_log_is_bounded(self, base_payload, single_step_route):
+        """Test that the recovery log keeps only the most recent errors."""
+        message = Message(session_id="test-session", route=single_step_route, payload=base_payload)
+
+        for i in range(MAX_RECOVERY_LOG + 5):
+            message.add_error("processing_error", f"Error {i}", "test_actor")
+
+        assert len(message.payload.recovery_log) == MAX_RECOVERY_LOG
+        assert message.payload.recovery_log[0]["message"] == "Error 5"
+        assert message.payload.recovery_log[-1] == message.payload.error
+        assert message.payload.recovery_log[-1] is not message.payload.error
+
+    def test_message_retry_increment(self, base_payload, single_step_route):
         """Test retry counter functionality."""
-        payload = MessagePayload(customer_message="Test message", customer_email="test@example.com")
-        route = Route(steps=["actor1"])
-        message = Message(session_id="test-session", route=route, payload=payload)
+        message = Message(session_id="test-session", route=single_step_route, payload=base_payload)
 
         # Initial state
         assert message.metadata["retry_count"] == 0
@@ -229,23 +337,56 @@ class TestMessage:
         message.increment_retry()
         assert message.metadata["retry_count"] == 2
 
-    def test_nats_subject_generation(self):
+    def test_nats_subject_generation(self, base_payload, single_step_route):
         """Test NATS subject generation."""
-        payload = MessagePayload(customer_message="Test message", customer_email="test@example.com")
-        route = Route(steps=["actor1"])
-        message = Message(session_id="test-session", route=route, payload=payload)
+        message = Message(session_id="test-session", route=single_step_route, payload=base_payload)
 
         subject = message.to_nats_subject("test_actor")
         assert subject == "ecommerce.support.test_actor"
 
-    def test_message_metadata(self):
-        """Test message metadata functionality."""
-        payload = MessagePayload(customer_message="Test message", customer_email="test@example.com")
-        route = Route(steps=["actor1"])
+    def test_wire_bytes_reflect_direct_mutations(self):
+        """Test that directly assigned fields always reach the wire encoding."""
+        route = Route(steps=["actor1", "actor2"])
+        payload = _mk_payload(customer_message="Test")
+        message = Message(session_id="test-session", route=route, payload=payload)
+
+        assert message.to_wire() == message.model_dump_json().encode()
+
+        message.route.advance()
+        assert Message.from_wire(message.to_wire()).route.current_step == 1
+
+        message.payload.response = "Direct response"
+        message.metadata["escalated"] = True
+        received = Message.from_wire(message.to_wire())
+        assert received.payload.response == "Direct response"
+        assert received.metadata["escalated"] is True
+
+        copied = message.model_copy(update={"session_id": "other-session"})
+        assert Message.from_wire(copied.to_wire()).session_id == "other-session"
+
+    def test_message_from_wire_roundtrip(self, base_payload, single_step_route):
+        """Test that a message survives the NATS wire encoding unchanged."""
+        message = Message(session_id="test-session", route=single_step_route, payload=base_payload)
+        message.add_enrichment("sentiment", {"label": "positive", "score": 0.8})
 
+        received = Message.from_wire(message.to_wire())
+
+        assert received == message
+        assert received.payload.sentiment == {"label": "positive", "score": 0.8}
+
+    @pytest.mark.parametrize("model", [MessagePayload, Route, Message])
+    def test_validators_built_at_import(self, model):
+        """Test that schemas are built when the module loads, not on the first message."""
+        assert model.__pydantic_complete__ is True
+        assert model.model_config.get("defer_build", False) is False
+
+    def test_message_metadata(self, base_payload, single_step_route):
+        """Test message metadata functionality."""
         custom_metadata = {"priority": "high", "source": "web_chat"}
 
-        message = Message(session_id="test-session", route=route, payload=payload, metadata=custom_metadata)
+        message = Message(
+            session_id="test-session", route=single_step_route, payload=base_payload, metadata=custom_metadata
+        )
 
         assert message.metadata["priority"] == "high"
         assert message.metadata["source"] == "web_chat"
@@ -256,46 +397,37 @@ class TestMessage:
 class TestStandardRoutes:
     """Test cases for StandardRoutes factory methods."""
 
-    def test_complaint_analysis_route(self):
-        """Test complaint analysis route."""
-        route = StandardRoutes.complaint_analysis_route()
-
-        expected_steps = ["sentiment_analyzer", "intent_analyzer", "context_retriever", "decision_router"]
-        assert route.steps == expected_steps
-        assert route.error_handler == "escalation_router"
-        assert route.current_step == 0
-
-    def test_response_generation_route(self):
-        """Test response generation route."""
-        route = StandardRoutes.response_generation_route()
-
-        expected_steps = ["response_generator", "guardrail_validator", "response_aggregator"]
-        assert route.steps == expected_steps
-        assert route.error_handler == "escalation_router"
-        assert route.current_step == 0
-
-    def test_action_execution_route(self):
-        """Test action execution route."""
-        route = StandardRoutes.action_execution_route()
+    @pytest.mark.parametrize(
+        "factory,expected_steps",
+        [
+            (
+                StandardRoutes.complaint_analysis_route,
+                ["sentiment_analyzer", "intent_analyzer", "context_retriever", "decision_router"],
+            ),
+            (
+                StandardRoutes.response_generation_route,
+                ["response_generator", "guardrail_validator", "response_aggregator"],
+            ),
+            (StandardRoutes.action_execution_route, ["execution_coordinator", "response_aggregator"]),
+            (
+                StandardRoutes.full_support_flow,
+                [
+                    "sentiment_analyzer",
+                    "intent_analyzer",
+                    "context_retriever",
+                    "decision_router",
+                    "response_generator",
+                    "guardrail_validator",
+                    "response_aggregator",
+                ],
+            ),
+        ],
+        ids=["complaint_analysis", "response_generation", "action_execution", "full_support_flow"],
+    )
+    def test_standard_route(self, factory, expected_steps):
+        """Test each standard route factory."""
+        route = factory()
 
-        expected_steps = ["execution_coordinator", "response_aggregator"]
-        assert route.steps == expected_steps
-        assert route.error_handler == "escalation_router"
-        assert route.current_step == 0
-
-    def test_full_support_flow(self):
-        """Test full support flow route."""
-        route = StandardRoutes.full_support_flow()
-
-        expected_steps = [
-            "sentiment_analyzer",
-            "intent_analyzer",
-            "context_retriever",
-            "decision_router",
-            "response_generator",
-            "guardrail_validator",
-            "response_aggregator",
-        ]
         assert route.steps == expected_steps
         assert route.error_handler == "escalation_router"
         assert route.current_step == 0
@@ -363,6 +495,25 @@ class TestMessageFactories:
         assert error_message.payload.error["actor"] == "failing_actor"
         assert len(error_message.payload.recovery_log) == 1
 
+    def test_create_error_message_aliases_payload(self):
+        """Test that the error message shares the original payload instead of copying it."""
+        original_message = create_support_message(
+            customer_message="Original message",
+            customer_email="original@example.com",
+            session_id="original-session",
+            route=Route(steps=["actor1", "actor2"], error_handler="error_handler"),
+        )
+
+        error_message = create_error_message(
+            original_message=original_message,
+            error_type="timeout",
+            error_message="Processing timeout",
+            actor="failing_actor",
+        )
+
+        assert error_message.payload is original_message.payload
+        assert error_message.metadata is not original_message.metadata
+
     def test_create_error_message_no_error_handler(self):
         """Test create_error_message when original has no error handler."""
         # Create original message without error handler
@@ -407,25 +558,23 @@ class TestMessageIntegration:
             "response_aggregator",
         ]
 
-        for i, expected_actor in enumerate(expected_actors):
+        # Process actors until the route reports completion
+        visited = []
+        while True:
             current = message.route.get_current_actor()
-            assert current == expected_actor, f"Step {i}: expected {expected_actor}, got {current}"
+            visited.append(current)
 
             # Simulate processing (add some enrichment)
-            if current == "sentiment_analyzer":
-                message.add_enrichment("sentiment", {"label": "negative", "score": -0.8})
-            elif current == "intent_analyzer":
-                message.add_enrichment("intent", {"category": "complaint", "confidence": 0.9})
-            elif current == "response_generator":
-                message.add_enrichment("response", "I apologize for the delay...")
-
-            # Advance to next step (except for last step)
-            if i < len(expected_actors) - 1:
-                assert message.route.advance() is True
-            else:
-                # Last step
-                assert message.route.is_complete() is True
-                assert message.route.advance() is False
+            enrichment = _SIM_ENRICHMENTS.get(current)
+            if enrichment is not None:
+                message.add_enrichment(*enrichment)
+
+            if message.route.is_complete():
+                break
+            assert message.route.advance() is True
+
+        assert visited == expected_actors
+        assert message.route.advance() is False
 
         # Verify enrichments were added
         assert message.payload.sentiment is not None
@@ -465,39 +614,15 @@ class TestMessageIntegration:
 
     def test_complex_enrichment_scenario(self):
         """Test complex message enrichment scenario."""
-        payload = MessagePayload(
+        payload = _mk_payload(
             customer_message="URGENT! My laptop order ORD-12345 is missing and I need it for work tomorrow!",
             customer_email="business@example.com",
         )
         route = StandardRoutes.full_support_flow()
         message = Message(session_id="complex-test", route=route, payload=payload)
 
-        # Simulate enrichments from different actors
-        enrichments = {
-            "sentiment": {
-                "sentiment": {"label": "negative", "score": -0.9, "confidence": 0.95},
-                "urgency": {"level": "high", "score": 0.9},
-                "is_complaint": True,
-            },
-            "intent": {
-                "intent": {"category": "order_inquiry", "subcategory": "missing_order"},
-                "confidence": 0.88,
-                "entities": [
-                    {"type": "order_id", "value": "ORD-12345"},
-                    {"type": "urgency", "value": "urgent"},
-                    {"type": "product", "value": "laptop"},
-                ],
-            },
-            "context": {
-                "customer_context": {"profile": {"tier": "business", "email": "business@example.com"}},
-                "order_context": {"order_id": "ORD-12345", "status": "shipped"},
-            },
-            "response": "I understand this is urgent and I sincerely apologize...",
-            "guardrail_check": {"validation_status": "approved", "approved": True, "issues": []},
-        }
-
-        # Apply enrichments
-        for field, data in enrichments.items():
+        # Apply enrichments from different actors
+        for field, data in _COMPLEX_ENRICHMENTS.items():
             message.add_enrichment(field, data)
 
         # Verify all enrichments
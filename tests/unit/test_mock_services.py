@@ -5,10 +5,13 @@ Tests the mock API services including CustomerAPI, OrdersAPI, and TrackingAPI
 to ensure they provide realistic test data and handle various scenarios correctly.
 """
 
+import asyncio
 from datetime import datetime
+from types import MappingProxyType
 
+import httpx
 import pytest
-from fastapi.testclient import TestClient
+import pytest_asyncio
 from mock_services.customer_api import (
     CustomerOrder,
     CustomerProfile,
@@ -20,149 +23,205 @@ from mock_services.customer_api import (
     app as customer_app,
 )
 
+# Customers created by MockCustomerAPI's sample data
+SAMPLE_EMAILS = ("john.doe@example.com", "jane.smith@example.com", "bob.wilson@example.com")
 
-class TestCustomerProfile:
-    """Test cases for CustomerProfile model."""
+# Allowed values of the mock models' enumerated string fields
+VALID_TIERS = frozenset({"standard", "premium", "vip"})
+VALID_ACCOUNT_STATUSES = frozenset({"active", "suspended", "premium"})
+VALID_ORDER_STATUSES = frozenset({"pending", "confirmed", "shipped", "delivered", "cancelled"})
+ORDER_ITEM_KEYS = frozenset({"name", "quantity", "price"})
 
-    def test_customer_profile_creation(self):
-        """Test creating a customer profile."""
-        profile = CustomerProfile(
-            customer_id="CUST-12345",
-            email="test@example.com",
-            first_name="John",
-            last_name="Doe",
-            phone="+1-555-0123",
-            tier="premium",
-            registration_date="2023-01-15T10:30:00",
-        )
 
-        assert profile.customer_id == "CUST-12345"
-        assert profile.email == "test@example.com"
-        assert profile.first_name == "John"
-        assert profile.last_name == "Doe"
-        assert profile.phone == "+1-555-0123"
-        assert profile.tier == "premium"
-        assert profile.account_status == "active"  # Default value
-
-    def test_customer_profile_optional_fields(self):
-        """Test customer profile with minimal required fields."""
-        profile = CustomerProfile(
-            customer_id="CUST-12345",
-            email="test@example.com",
-            first_name="John",
-            last_name="Doe",
-            registration_date="2023-01-15T10:30:00",
-        )
+def _parse_iso(value: str) -> datetime:
+    """Parse an ISO-8601 timestamp, accepting a trailing Z for UTC."""
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
 
-        assert profile.phone is None
-        assert profile.last_login is None
-        assert profile.preferences == {}
-        assert profile.address is None
-
-    def test_customer_profile_with_preferences(self):
-        """Test customer profile with preferences."""
-        preferences = {
-            "email_notifications": True,
-            "sms_notifications": False,
-            "newsletter": True,
-        }
-
-        profile = CustomerProfile(
-            customer_id="CUST-12345",
-            email="test@example.com",
-            first_name="John",
-            last_name="Doe",
-            registration_date="2023-01-15T10:30:00",
-            preferences=preferences,
-        )
 
-        assert profile.preferences == preferences
+_real_sleep = asyncio.sleep
 
 
-class TestCustomerOrder:
-    """Test cases for CustomerOrder model."""
+async def _no_delay(delay, result=None):
+    """Stand-in for asyncio.sleep that only yields to the event loop."""
+    return await _real_sleep(0, result)
 
-    def test_customer_order_creation(self):
-        """Test creating a customer order."""
-        items = [
-            {"name": "Laptop", "quantity": 1, "price": 999.99},
-            {"name": "Mouse", "quantity": 1, "price": 29.99},
-        ]
 
-        order = CustomerOrder(
-            order_id="ORD-12345",
-            customer_id="CUST-12345",
-            status="shipped",
-            total_amount=1029.98,
-            items=items,
-            order_date="2024-01-10T14:30:00",
-            tracking_number="TRK123456789",
-        )
+@pytest.fixture(autouse=True)
+def _skip_simulated_delays(request, monkeypatch):
+    """Drop the mock API's simulated latency, except in the test that measures it."""
+    if "delays_simulation" not in request.node.name:
+        monkeypatch.setattr(asyncio, "sleep", _no_delay)
 
-        assert order.order_id == "ORD-12345"
-        assert order.customer_id == "CUST-12345"
-        assert order.status == "shipped"
-        assert order.total_amount == 1029.98
-        assert order.currency == "USD"  # Default value
-        assert len(order.items) == 2
-        assert order.tracking_number == "TRK123456789"
-
-    def test_customer_order_minimal(self):
-        """Test customer order with minimal required fields."""
-        order = CustomerOrder(
-            order_id="ORD-12345",
-            customer_id="CUST-12345",
-            status="pending",
-            total_amount=100.0,
-            items=[{"name": "Test Item", "quantity": 1, "price": 100.0}],
-            order_date="2024-01-10T14:30:00",
-        )
 
-        assert order.estimated_delivery is None
-        assert order.tracking_number is None
-        assert order.currency == "USD"
+def _first_customer(api):
+    """Return the first sample customer without copying the whole customer table."""
+    return next(iter(api.customers.values()))
 
 
-class TestCustomerSupport:
-    """Test cases for CustomerSupport model."""
+@pytest.fixture(scope="session")
+def readonly_api():
+    """MockCustomerAPI shared by the whole session, with its tables behind read-only views."""
+    api = MockCustomerAPI()
+    api.customers = MappingProxyType(api.customers)
+    api.orders = MappingProxyType(api.orders)
+    api.support_history = MappingProxyType(api.support_history)
+    return api
 
-    def test_customer_support_creation(self):
-        """Test creating a customer support interaction."""
-        support = CustomerSupport(
-            interaction_id="SUP-12345",
-            customer_id="CUST-12345",
-            type="complaint",
-            status="in_progress",
-            priority="high",
-            subject="Order delivery issue",
-            description="My order hasn't arrived and it's past the estimated delivery date.",
-            created_date="2024-01-15T09:00:00",
-            agent_id="AGT001",
-        )
 
-        assert support.interaction_id == "SUP-12345"
-        assert support.customer_id == "CUST-12345"
-        assert support.type == "complaint"
-        assert support.status == "in_progress"
-        assert support.priority == "high"
-        assert support.subject == "Order delivery issue"
-        assert support.agent_id == "AGT001"
-
-    def test_customer_support_optional_fields(self):
-        """Test customer support with minimal fields."""
-        support = CustomerSupport(
-            interaction_id="SUP-12345",
-            customer_id="CUST-12345",
-            type="inquiry",
-            status="open",
-            priority="low",
-            subject="General question",
-            description="I have a question about your return policy.",
-            created_date="2024-01-15T09:00:00",
-        )
+_PROFILE_REQUIRED = {
+    "customer_id": "CUST-12345",
+    "email": "test@example.com",
+    "first_name": "John",
+    "last_name": "Doe",
+    "registration_date": "2023-01-15T10:30:00",
+}
+
+_ORDER_ITEMS = [
+    {"name": "Laptop", "quantity": 1, "price": 999.99},
+    {"name": "Mouse", "quantity": 1, "price": 29.99},
+]
+
+_PREFERENCES = {
+    "email_notifications": True,
+    "sms_notifications": False,
+    "newsletter": True,
+}
+
+
+def _assert_fields(model, expected):
+    """Assert that each expected attribute of a model has the given value."""
+    assert {name: getattr(model, name) for name in expected} == expected
+
+
+class TestCustomerProfile:
+    """Test cases for CustomerProfile model."""
+
+    @pytest.mark.parametrize(
+        "extra,expected",
+        [
+            pytest.param(
+                {"phone": "+1-555-0123", "tier": "premium"},
+                {
+                    **_PROFILE_REQUIRED,
+                    "phone": "+1-555-0123",
+                    "tier": "premium",
+                    "account_status": "active",  # Default value
+                },
+                id="creation",
+            ),
+            pytest.param(
+                {},
+                {"phone": None, "last_login": None, "preferences": {}, "address": None},
+                id="optional_fields",
+            ),
+            pytest.param({"preferences": _PREFERENCES}, {"preferences": _PREFERENCES}, id="with_preferences"),
+        ],
+    )
+    def test_customer_profile(self, extra, expected):
+        """Test creating customer profiles with and without optional fields."""
+        profile = CustomerProfile(**_PROFILE_REQUIRED, **extra)
+
+        _assert_fields(profile, expected)
+
+
+class TestCustomerOrder:
+    """Test cases for CustomerOrder model."""
+
+    @pytest.mark.parametrize(
+        "kwargs,expected",
+        [
+            pytest.param(
+                {
+                    "order_id": "ORD-12345",
+                    "customer_id": "CUST-12345",
+                    "status": "shipped",
+                    "total_amount": 1029.98,
+                    "items": _ORDER_ITEMS,
+                    "order_date": "2024-01-10T14:30:00",
+                    "tracking_number": "TRK123456789",
+                },
+                {
+                    "order_id": "ORD-12345",
+                    "customer_id": "CUST-12345",
+                    "status": "shipped",
+                    "total_amount": 1029.98,
+                    "currency": "USD",  # Default value
+                    "items": _ORDER_ITEMS,
+                    "tracking_number": "TRK123456789",
+                },
+                id="creation",
+            ),
+            pytest.param(
+                {
+                    "order_id": "ORD-12345",
+                    "customer_id": "CUST-12345",
+                    "status": "pending",
+                    "total_amount": 100.0,
+                    "items": [{"name": "Test Item", "quantity": 1, "price": 100.0}],
+                    "order_date": "2024-01-10T14:30:00",
+                },
+                {"estimated_delivery": None, "tracking_number": None, "currency": "USD"},
+                id="minimal",
+            ),
+        ],
+    )
+    def test_customer_order(self, kwargs, expected):
+        """Test creating customer orders with and without optional fields."""
+        order = CustomerOrder(**kwargs)
+
+        _assert_fields(order, expected)
+
+
+class TestCustomerSupport:
+    """Test cases for CustomerSupport model."""
 
-        assert support.resolved_date is None
-        assert support.agent_id is None
+    @pytest.mark.parametrize(
+        "kwargs,expected",
+        [
+            pytest.param(
+                {
+                    "interaction_id": "SUP-12345",
+                    "customer_id": "CUST-12345",
+                    "type": "complaint",
+                    "status": "in_progress",
+                    "priority": "high",
+                    "subject": "Order delivery issue",
+                    "description": "My order hasn't arrived and it's past the estimated delivery date.",
+                    "created_date": "2024-01-15T09:00:00",
+                    "agent_id": "AGT001",
+                },
+                {
+                    "interaction_id": "SUP-12345",
+                    "customer_id": "CUST-12345",
+                    "type": "complaint",
+                    "status": "in_progress",
+                    "priority": "high",
+                    "subject": "Order delivery issue",
+                    "agent_id": "AGT001",
+                },
+                id="creation",
+            ),
+            pytest.param(
+                {
+                    "interaction_id": "SUP-12345",
+                    "customer_id": "CUST-12345",
+                    "type": "inquiry",
+                    "status": "open",
+                    "priority": "low",
+                    "subject": "General question",
+                    "description": "I have a question about your return policy.",
+                    "created_date": "2024-01-15T09:00:00",
+                },
+                {"resolved_date": None, "agent_id": None},
+                id="optional_fields",
+            ),
+        ],
+    )
+    def test_customer_support(self, kwargs, expected):
+        """Test creating customer support interactions with and without optional fields."""
+        support = CustomerSupport(**kwargs)
+
+        _assert_fields(support, expected)
 
 
 class TestMockCustomerAPI:
@@ -170,7 +229,7 @@ class TestMockCustomerAPI:
 
     @pytest.fixture
     def api(self):
-        """Create a fresh MockCustomerAPI instance for testing."""
+        """Create a fresh MockCustomerAPI instance, since these tests mutate it."""
         return MockCustomerAPI()
 
     def test_api_initialization(self, api):
@@ -180,9 +239,8 @@ class TestMockCustomerAPI:
         assert len(api.support_history) > 0
 
         # Check that sample customers exist
-        sample_emails = ["john.doe@example.com", "jane.smith@example.com", "bob.wilson@example.com"]
-        for email in sample_emails:
-            assert email in api.customers
+        missing = set(SAMPLE_EMAILS) - api.customers.keys()
+        assert not missing
 
     def test_sample_data_structure(self, api):
         """Test structure of sample data."""
@@ -193,7 +251,7 @@ class TestMockCustomerAPI:
             assert customer.email
             assert customer.first_name
             assert customer.last_name
-            assert customer.tier in ["standard", "premium", "vip"]
+            assert customer.tier in VALID_TIERS
 
         # Check orders are properly structured
         for email, orders in api.orders.items():
@@ -259,7 +317,7 @@ class TestMockCustomerAPI:
     async def test_get_customer_support_history_success(self, api):
         """Test successful support history retrieval."""
         # Get a customer ID from sample data
-        customer = list(api.customers.values())[0]
+        customer = _first_customer(api)
         customer_id = customer.customer_id
 
         history = await api.get_customer_support_history(customer_id)
@@ -273,7 +331,7 @@ class TestMockCustomerAPI:
     @pytest.mark.asyncio
     async def test_get_customer_support_history_with_limit(self, api):
         """Test support history retrieval with limit."""
-        customer = list(api.customers.values())[0]
+        customer = _first_customer(api)
         customer_id = customer.customer_id
         limit = 3
 
@@ -293,7 +351,7 @@ class TestMockCustomerAPI:
     @pytest.mark.asyncio
     async def test_update_customer_tier_success(self, api):
         """Test successful customer tier update."""
-        customer = list(api.customers.values())[0]
+        customer = _first_customer(api)
         customer_id = customer.customer_id
         original_tier = customer.tier
         new_tier = "vip" if original_tier != "vip" else "premium"
@@ -316,7 +374,7 @@ class TestMockCustomerAPI:
     @pytest.mark.asyncio
     async def test_add_customer_note_success(self, api):
         """Test successfully adding a customer note."""
-        customer = list(api.customers.values())[0]
+        customer = _first_customer(api)
         customer_id = customer.customer_id
         note = "Customer called to inquire about shipping."
         agent_id = "AGT123"
@@ -348,6 +406,7 @@ class TestMockCustomerAPI:
         assert customer_id in api.support_history
         assert len(api.support_history[customer_id]) == 1
 
+    @pytest.mark.slow
     @pytest.mark.asyncio
     async def test_api_delays_simulation(self, api):
         """Test that API calls include simulated delays."""
@@ -361,18 +420,27 @@ class TestMockCustomerAPI:
         assert elapsed_time >= 0.1
 
 
+@pytest.mark.asyncio(loop_scope="session")
 class TestCustomerAPIHTTPEndpoints:
     """Test cases for HTTP endpoints of the Customer API."""
 
-    @pytest.fixture
-    def client(self):
-        """Create a test client for the FastAPI app."""
-        return TestClient(customer_app)
+    @pytest_asyncio.fixture(scope="module", loop_scope="session")
+    async def client(self):
+        """Create an in-process client for the FastAPI app, shared by the whole class."""
+        transport = httpx.ASGITransport(app=customer_app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            yield client
+
+    @pytest_asyncio.fixture(scope="module", loop_scope="session")
+    async def john_doe_id(self, client):
+        """Look up the customer ID of a sample customer once for the whole class."""
+        response = await client.get("/customers/john.doe@example.com")
+        return response.json()["customer_id"]
 
-    def test_get_customer_success(self, client):
+    async def test_get_customer_success(self, client):
         """Test GET /customers/{email} success."""
         email = "john.doe@example.com"
-        response = client.get(f"/customers/{email}")
+        response = await client.get(f"/customers/{email}")
 
         assert response.status_code == 200
         data = response.json()
@@ -380,18 +448,18 @@ class TestCustomerAPIHTTPEndpoints:
         assert "customer_id" in data
         assert "first_name" in data
 
-    def test_get_customer_not_found(self, client):
+    async def test_get_customer_not_found(self, client):
         """Test GET /customers/{email} with non-existent customer."""
         email = "nonexistent@example.com"
-        response = client.get(f"/customers/{email}")
+        response = await client.get(f"/customers/{email}")
 
         assert response.status_code == 404
-        assert "Customer not found" in response.json()["detail"]
+        assert response.content == b'{"detail":"Customer not found"}'
 
-    def test_get_customer_orders_success(self, client):
+    async def test_get_customer_orders_success(self, client):
         """Test GET /customers/{email}/orders success."""
         email = "john.doe@example.com"
-        response = client.get(f"/customers/{email}/orders")
+        response = await client.get(f"/customers/{email}/orders")
 
         assert response.status_code == 200
         data = response.json()
@@ -403,31 +471,28 @@ class TestCustomerAPIHTTPEndpoints:
             assert "customer_id" in order
             assert "status" in order
 
-    def test_get_customer_orders_with_limit(self, client):
+    async def test_get_customer_orders_with_limit(self, client):
         """Test GET /customers/{email}/orders with limit parameter."""
         email = "john.doe@example.com"
         limit = 2
-        response = client.get(f"/customers/{email}/orders?limit={limit}")
+        response = await client.get(f"/customers/{email}/orders?limit={limit}")
 
         assert response.status_code == 200
         data = response.json()
         assert len(data) <= limit
 
-    def test_get_customer_orders_customer_not_found(self, client):
+    async def test_get_customer_orders_customer_not_found(self, client):
         """Test GET /customers/{email}/orders for non-existent customer."""
         email = "nonexistent@example.com"
-        response = client.get(f"/customers/{email}/orders")
+        response = await client.get(f"/customers/{email}/orders")
 
         assert response.status_code == 404
 
-    def test_get_support_history_success(self, client):
+    async def test_get_support_history_success(self, client, john_doe_id):
         """Test GET /customers/{customer_id}/support-history success."""
-        # First get a customer to get their ID
-        email = "john.doe@example.com"
-        customer_response = client.get(f"/customers/{email}")
-        customer_id = customer_response.json()["customer_id"]
+        customer_id = john_doe_id
 
-        response = client.get(f"/customers/{customer_id}/support-history")
+        response = await client.get(f"/customers/{customer_id}/support-history")
 
         assert response.status_code == 200
         data = response.json()
@@ -437,59 +502,53 @@ class TestCustomerAPIHTTPEndpoints:
             assert "interaction_id" in interaction
             assert interaction["customer_id"] == customer_id
 
-    def test_update_customer_tier_success(self, client):
+    async def test_update_customer_tier_success(self, client, john_doe_id):
         """Test PUT /customers/{customer_id}/tier success."""
-        # First get a customer to get their ID
-        email = "john.doe@example.com"
-        customer_response = client.get(f"/customers/{email}")
-        customer_id = customer_response.json()["customer_id"]
+        customer_id = john_doe_id
 
-        response = client.put(f"/customers/{customer_id}/tier", json={"tier": "vip"})
+        response = await client.put(f"/customers/{customer_id}/tier", json={"tier": "vip"})
 
         assert response.status_code == 200
-        assert "updated successfully" in response.json()["message"]
+        assert response.content == b'{"message":"Customer tier updated successfully"}'
 
-    def test_update_customer_tier_missing_data(self, client):
+    async def test_update_customer_tier_missing_data(self, client):
         """Test PUT /customers/{customer_id}/tier with missing tier data."""
         customer_id = "CUST-12345"
-        response = client.put(f"/customers/{customer_id}/tier", json={})
+        response = await client.put(f"/customers/{customer_id}/tier", json={})
 
         assert response.status_code == 400
-        assert "Tier is required" in response.json()["detail"]
+        assert response.content == b'{"detail":"Tier is required"}'
 
-    def test_update_customer_tier_not_found(self, client):
+    async def test_update_customer_tier_not_found(self, client):
         """Test PUT /customers/{customer_id}/tier for non-existent customer."""
         customer_id = "NONEXISTENT-ID"
-        response = client.put(f"/customers/{customer_id}/tier", json={"tier": "premium"})
+        response = await client.put(f"/customers/{customer_id}/tier", json={"tier": "premium"})
 
         assert response.status_code == 404
 
-    def test_add_customer_note_success(self, client):
+    async def test_add_customer_note_success(self, client, john_doe_id):
         """Test POST /customers/{customer_id}/notes success."""
-        # First get a customer to get their ID
-        email = "john.doe@example.com"
-        customer_response = client.get(f"/customers/{email}")
-        customer_id = customer_response.json()["customer_id"]
+        customer_id = john_doe_id
 
-        response = client.post(
+        response = await client.post(
             f"/customers/{customer_id}/notes",
             json={"note": "Customer called about delivery inquiry", "agent_id": "AGT123"},
         )
 
         assert response.status_code == 200
-        assert "added successfully" in response.json()["message"]
+        assert response.content == b'{"message":"Note added successfully"}'
 
-    def test_add_customer_note_missing_data(self, client):
+    async def test_add_customer_note_missing_data(self, client):
         """Test POST /customers/{customer_id}/notes with missing note data."""
         customer_id = "CUST-12345"
-        response = client.post(f"/customers/{customer_id}/notes", json={"agent_id": "AGT123"})
+        response = await client.post(f"/customers/{customer_id}/notes", json={"agent_id": "AGT123"})
 
         assert response.status_code == 400
-        assert "Note is required" in response.json()["detail"]
+        assert response.content == b'{"detail":"Note is required"}'
 
-    def test_health_check(self, client):
+    async def test_health_check(self, client):
         """Test GET /health endpoint."""
-        response = client.get("/health")
+        response = await client.get("/health")
 
         assert response.status_code == 200
         data = response.json()
@@ -514,98 +573,94 @@ class TestCustomerAPIUtilities:
 class TestCustomerAPIDataConsistency:
     """Test cases for data consistency and relationships."""
 
-    @pytest.fixture
-    def api(self):
-        """Create a fresh MockCustomerAPI instance for testing."""
-        return MockCustomerAPI()
-
     @pytest.mark.asyncio
-    async def test_customer_order_relationship(self, api):
+    async def test_customer_order_relationship(self, readonly_api):
         """Test that customer orders reference valid customers."""
-        for email, orders in api.orders.items():
-            # Email should exist in customers
-            assert email in api.customers
-            customer = api.customers[email]
-
-            for order in orders:
-                # Order customer_id should match customer
-                assert order.customer_id == customer.customer_id
+        # Email should exist in customers
+        assert readonly_api.orders.keys() <= readonly_api.customers.keys()
+
+        # Order customer_id should match customer
+        mismatched = [
+            order.order_id
+            for email, orders in readonly_api.orders.items()
+            for order in orders
+            if order.customer_id != readonly_api.customers[email].customer_id
+        ]
+        assert not mismatched
 
     @pytest.mark.asyncio
-    async def test_support_history_consistency(self, api):
+    async def test_support_history_consistency(self, readonly_api):
         """Test that support history references valid customers."""
-        for customer_id, interactions in api.support_history.items():
-            for interaction in interactions:
-                # Support interaction customer_id should match
-                assert interaction.customer_id == customer_id
+        # Support interaction customer_id should match
+        mismatched = [
+            interaction.interaction_id
+            for customer_id, interactions in readonly_api.support_history.items()
+            for interaction in interactions
+            if interaction.customer_id != customer_id
+        ]
+        assert not mismatched
 
     @pytest.mark.asyncio
-    async def test_order_data_validity(self, api):
+    async def test_order_data_validity(self, readonly_api):
         """Test that order data is valid and consistent."""
-        for orders in api.orders.values():
-            for order in orders:
-                # Order total should be reasonable
-                assert order.total_amount > 0
-                assert order.total_amount < 10000  # Reasonable upper bound
-
-                # Items should exist and have valid data
-                assert len(order.items) > 0
-                for item in order.items:
-                    assert "name" in item
-                    assert "quantity" in item
-                    assert "price" in item
-                    assert item["quantity"] > 0
-                    assert item["price"] >= 0
-
-                # Status should be valid
-                valid_statuses = ["pending", "confirmed", "shipped", "delivered", "cancelled"]
-                assert order.status in valid_statuses
+        orders = [order for orders in readonly_api.orders.values() for order in orders]
+
+        # Order total should be reasonable (upper bound 10000)
+        assert not [order.order_id for order in orders if not 0 < order.total_amount < 10000]
+
+        # Items should exist and have valid data
+        assert not [order.order_id for order in orders if not order.items]
+        invalid_items = [
+            item
+            for order in orders
+            for item in order.items
+            if not (ORDER_ITEM_KEYS <= item.keys() and item["quantity"] > 0 and item["price"] >= 0)
+        ]
+        assert not invalid_items
+
+        # Status should be valid
+        assert not [order.order_id for order in orders if order.status not in VALID_ORDER_STATUSES]
 
     @pytest.mark.asyncio
-    async def test_customer_tier_validity(self, api):
+    async def test_customer_tier_validity(self, readonly_api):
         """Test that customer tiers are valid."""
-        valid_tiers = ["standard", "premium", "vip"]
-
-        for customer in api.customers.values():
-            assert customer.tier in valid_tiers
-            assert customer.account_status in ["active", "suspended", "premium"]
+        for customer in readonly_api.customers.values():
+            assert customer.tier in VALID_TIERS
+            assert customer.account_status in VALID_ACCOUNT_STATUSES
 
     @pytest.mark.asyncio
-    async def test_date_formats(self, api):
+    async def test_date_formats(self, readonly_api):
         """Test that dates are in proper ISO format."""
-        for customer in api.customers.values():
-            # Should be able to parse registration date
-            datetime.fromisoformat(customer.registration_date.replace("Z", "+00:00"))
+        dates = [customer.registration_date for customer in readonly_api.customers.values()]
+        dates += [customer.last_login for customer in readonly_api.customers.values() if customer.last_login]
+        for orders in readonly_api.orders.values():
+            dates += [order.order_date for order in orders]
+            dates += [order.estimated_delivery for order in orders if order.estimated_delivery]
 
-            if customer.last_login:
-                datetime.fromisoformat(customer.last_login.replace("Z", "+00:00"))
-
-        for orders in api.orders.values():
-            for order in orders:
-                # Should be able to parse order date
-                datetime.fromisoformat(order.order_date.replace("Z", "+00:00"))
-
-                if order.estimated_delivery:
-                    datetime.fromisoformat(order.estimated_delivery.replace("Z", "+00:00"))
+        for date in set(dates):
+            # Should be able to parse the date
+            _parse_iso(date)
 
 
 class TestCustomerAPIPerformance:
     """Test cases for performance characteristics."""
 
-    @pytest.fixture
-    def api(self):
-        """Create a MockCustomerAPI instance for testing."""
-        return MockCustomerAPI()
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("email", SAMPLE_EMAILS)
+    async def test_single_request(self, readonly_api, email):
+        """Test retrieving each sample customer on its own."""
+        customer = await readonly_api.get_customer_by_email(email)
+
+        assert customer is not None
+        assert customer.email == email
 
     @pytest.mark.asyncio
-    async def test_concurrent_requests(self, api):
+    async def test_concurrent_requests(self, readonly_api):
         """Test handling multiple concurrent requests."""
-        import asyncio
-
-        emails = list(api.customers.keys())[:3]
+        emails = SAMPLE_EMAILS
 
         # Create concurrent tasks
-        tasks = [api.get_customer_by_email(email) for email in emails]
+        tasks = [readonly_api.get_customer_by_email(email) for email in emails]
 
         # Execute concurrently
         results = await asyncio.gather(*tasks)
@@ -616,31 +671,29 @@ class TestCustomerAPIPerformance:
             assert result is not None
 
     @pytest.mark.asyncio
-    async def test_large_order_history(self, api):
-        """Test retrieving large order history."""
-        email = list(api.customers.keys())[0]
+    @pytest.mark.parametrize("limit", [0, 1, 3, 1000])
+    async def test_order_limit_bounds(self, readonly_api, limit):
+        """Test that order retrieval returns at most `limit` orders, and all of them for large limits."""
+        email = next(iter(readonly_api.customers))
 
-        # Test with large limit
-        orders = await api.get_customer_orders(email, limit=1000)
+        orders = await readonly_api.get_customer_orders(email, limit=limit)
 
-        # Should handle gracefully (return what's available)
         assert isinstance(orders, list)
-        assert len(orders) >= 0
+        assert len(orders) == min(limit, len(readonly_api.orders[email]))
 
     @pytest.mark.asyncio
-    async def test_response_time_consistency(self, api):
+    async def test_response_time_consistency(self, readonly_api):
         """Test that response times are consistent."""
         import time
 
-        email = list(api.customers.keys())[0]
-        times = []
+        email = next(iter(readonly_api.customers))
+        times = [0.0] * 5
 
-        # Make multiple requests and measure time
-        for _ in range(5):
-            start_time = time.time()
-            await api.get_customer_by_email(email)
-            elapsed_time = time.time() - start_time
-            times.append(elapsed_time)
+        # Make multiple requests and measure time (perf_counter is monotonic and high-resolution)
+        for i in range(len(times)):
+            start_time = time.perf_counter()
+            await readonly_api.get_customer_by_email(email)
+            times[i] = time.perf_counter() - start_time
 
         # Times should be reasonably consistent (within 50ms of each other)
         max_time = max(times)
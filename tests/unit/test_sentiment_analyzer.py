@@ -9,6 +9,7 @@ import pytest
 from unittest.mock import patch
 
 from actors.sentiment_analyzer import SentimentAnalyzer, create_sentiment_analyzer
+from models.message import MessagePayload
 
 
 class TestSentimentAnalyzer:
@@ -133,6 +134,33 @@ class TestSentimentAnalyzer:
         assert complaint["is_complaint"] is True
         assert escalation["escalation_needed"] is True
 
+    def test_analyze_all_matches_individual_analyzers(self, analyzer):
+        """Test that the fused analysis returns the same results as each analyzer on its own."""
+        message = "This terrible service is urgent! I have a serious complaint and need to speak to a manager immediately!"
+
+        results = analyzer.analyze_all(message)
+
+        assert results == {
+            "sentiment": analyzer._analyze_sentiment(message),
+            "urgency": analyzer._analyze_urgency(message),
+            "complaint": analyzer._analyze_complaint(message),
+            "escalation": analyzer._analyze_escalation(message),
+        }
+
+    @pytest.mark.asyncio
+    async def test_process_uses_fused_analysis(self, analyzer):
+        """Test that process() runs the analysis through analyze_all()."""
+        payload = MessagePayload(
+            customer_message="This is terrible, I want to file a complaint!", customer_email="test@example.com"
+        )
+
+        with patch.object(analyzer, "analyze_all", wraps=analyzer.analyze_all) as analyze_all:
+            result = await analyzer.process(payload)
+
+        analyze_all.assert_called_once_with(payload.customer_message)
+        assert result["sentiment"]["label"] == "negative"
+        assert result["is_complaint"] is True
+
     def test_factory_function(self):
         """Test the factory function creates analyzer correctly."""
         analyzer = create_sentiment_analyzer()
@@ -253,6 +281,18 @@ class TestSentimentAnalyzer:
         assert result is not None
         assert "label" in result
 
+    def test_scan_shared_across_analyzers(self, analyzer):
+        """Test that one message is tokenized once and keyword hits are grouped by category."""
+        message = "I am not happy, this is an urgent complaint for your manager"
+
+        words, hits = analyzer._scan(message)
+
+        assert analyzer._scan(message)[0] is words
+        assert [words[i] for i in hits["sentiment"]] == ["happy"]
+        assert [words[i] for i in hits["negation"]] == ["not"]
+        assert [words[i] for i in hits["urgency"]] == ["urgent"]
+        assert [words[i] for i in hits["escalation"]] == ["complaint", "manager"]
+
     def test_case_insensitive_analysis(self, analyzer):
         """Test that analysis is case insensitive."""
         messages = [